@@ -0,0 +1,184 @@
+"""Benchmark CrosswordGenerator over fixed, seeded word lists
+
+Usage:
+    python benchmarks/bench_generator.py --output results.json
+    python benchmarks/bench_generator.py --baseline benchmarks/baseline.json
+
+Every case is timed over --repeats runs (the fastest is reported), then run
+once more under tracemalloc for peak memory so tracing does not skew timings.
+The scale-* cases raise the word target step by step on a 41x41 grid; their
+ms per placed word should stay roughly flat as the target grows.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from crossword_generator import MAX_WORDS, CrosswordGenerator
+from generation_stats import GenerationStats
+from llm_service import LLMService
+
+MOCK_TOPICS = ("basketball", "movies", "technology", "general")
+SYNTHETIC_SIZES = (50, 200, 1000)
+GRID_SIZES = (15, 25, 41)
+# Word targets for the scale-* cases, each given a list twice as long
+SCALE_TARGETS = (25, 50, 100, 150)
+SCALE_GRID_SIZE = 41
+CORPUS_SEED = 1234
+GENERATION_SEED = 42
+
+# Rough English letter frequencies so synthetic words intersect like real ones
+LETTER_WEIGHTS = {
+    "E": 12.7, "T": 9.1, "A": 8.2, "O": 7.5, "I": 7.0, "N": 6.7, "S": 6.3,
+    "H": 6.1, "R": 6.0, "D": 4.3, "L": 4.0, "C": 2.8, "U": 2.8, "M": 2.4,
+    "W": 2.4, "F": 2.2, "G": 2.0, "Y": 2.0, "P": 1.9, "B": 1.5, "V": 1.0,
+    "K": 0.8, "J": 0.2, "X": 0.2, "Q": 0.1, "Z": 0.1,
+}
+
+def mock_words(topic: str) -> List[str]:
+    """Words from the LLM service's mock list for a topic"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [item["word"] for item in LLMService._get_mock_words(topic)]
+
+def synthetic_words(count: int, seed: int = CORPUS_SEED) -> List[str]:
+    """count distinct pseudo-words of 3-12 letters, the same for a given seed"""
+    rng = random.Random(seed)
+    letters = list(LETTER_WEIGHTS)
+    weights = list(LETTER_WEIGHTS.values())
+    words: Dict[str, None] = {}
+    while len(words) < count:
+        length = rng.randint(3, 12)
+        words["".join(rng.choices(letters, weights, k=length))] = None
+    return list(words)
+
+def build_cases() -> List[Dict]:
+    cases = [
+        {"name": f"mock-{topic}", "words": mock_words(topic), "grid_size": 15}
+        for topic in MOCK_TOPICS
+    ]
+    for count in SYNTHETIC_SIZES:
+        words = synthetic_words(count)
+        for grid_size in GRID_SIZES:
+            cases.append({"name": f"synthetic-{count}-grid{grid_size}", "words": words, "grid_size": grid_size})
+    for target in SCALE_TARGETS:
+        cases.append({"name": f"scale-{target}", "words": synthetic_words(target * 2),
+                      "grid_size": SCALE_GRID_SIZE, "max_words": target})
+    return cases
+
+def _generate(words: List[str], grid_size: int, strategy: str, max_words: Optional[int] = MAX_WORDS,
+              stats: Optional[GenerationStats] = None):
+    generator = CrosswordGenerator(words, grid_size=grid_size, strategy=strategy,
+                                   seed=GENERATION_SEED, max_words=max_words, stats=stats)
+    return generator.generate_crossword()
+
+def run_case(words: List[str], grid_size: int, strategy: str = "greedy", repeats: int = 3,
+             max_words: Optional[int] = MAX_WORDS) -> Dict:
+    """Wall time (fastest of repeats, including setup), call rate, words placed and peak memory"""
+    wall_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        crossword = _generate(words, grid_size, strategy, max_words)
+        wall_times.append(time.perf_counter() - start)
+
+    # can_place_word calls are counted on the traced run so neither the
+    # stats nor tracing affect the timed ones
+    stats = GenerationStats()
+    tracemalloc.start()
+    try:
+        _generate(words, grid_size, strategy, max_words, stats)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    wall = min(wall_times)
+    calls = stats.can_place_calls
+    placed = len(crossword.word_placements)
+    return {
+        "words": len(words),
+        "grid_size": grid_size,
+        "strategy": strategy,
+        "max_words": max_words,
+        "wall_ms": round(wall * 1000, 3),
+        "can_place_word_calls": calls,
+        "calls_per_sec": round(calls / wall) if wall > 0 else 0,
+        "words_placed": placed,
+        "ms_per_word": round(wall * 1000 / placed, 3) if placed else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], max_regression: float) -> List[str]:
+    """Print results against the baseline and return the cases that regressed
+
+    A case regresses when it is more than max_regression slower or places
+    fewer words. Cases run with a different strategy or word target than
+    their baseline entry are skipped, since their numbers are not comparable.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:32} {'new case':>12}")
+            continue
+        mismatched = [key for key in ("strategy", "max_words") if result.get(key) != base.get(key)]
+        if mismatched:
+            settings = ", ".join(f"{key}={base.get(key)}" for key in mismatched)
+            print(f"{name:32} {'skipped':>12}  baseline ran with {settings}")
+            continue
+        ratio = result["wall_ms"] / base["wall_ms"] if base["wall_ms"] else 1.0
+        placed = result["words_placed"] - base["words_placed"]
+        print(f"{name:32} {ratio:>11.2f}x  words placed {placed:+d}")
+        if ratio > 1 + max_regression or placed < 0:
+            regressions.append(name)
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a results JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="fail when a case is this much slower than the baseline (0.25 = 25%%)")
+    parser.add_argument("--strategy", default="greedy", choices=["greedy", "backtrack"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':32} {'wall ms':>10} {'calls/s':>12} {'placed':>7} {'ms/word':>8} {'peak KiB':>10}")
+    for case in build_cases():
+        if args.filter not in case["name"]:
+            continue
+        result = run_case(case["words"], case["grid_size"], args.strategy, args.repeats,
+                          case.get("max_words", MAX_WORDS))
+        results[case["name"]] = result
+        print(f"{case['name']:32} {result['wall_ms']:>10.1f} {result['calls_per_sec']:>12} "
+              f"{result['words_placed']:>7} {result['ms_per_word']:>8.2f} {result['peak_kib']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"Slower than baseline by more than {args.max_regression:.0%} or placing fewer words: "
+                  f"{', '.join(regressions)}")
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
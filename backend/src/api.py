@@ -1,15 +1,36 @@
+import os
+import json
 import uuid
-from typing import Dict
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 from models import (
-    TopicRequest, WordListRequest, TopicWordsResponse, 
-    CrosswordResponse, CluesResponse, Direction
+    TopicRequest, WordListRequest, BatchRequest, PuzzleRequest, TopicWordsResponse, 
+    CrosswordResponse, CluesResponse, CrosswordGrid, Direction
 )
-from crossword_generator import CrosswordGenerator
 from llm_service import LLMService
+from multi_start import shutdown_process_pool
+from generation_executor import GenerationExecutor, ExecutorSaturated, timed_build_crossword, record_build
+from result_cache import ResultCache, crossword_cache_key
+from session_store import create_session_store
+from metrics import MetricsMiddleware, registry
+from timing import ServerTimingMiddleware, span
+from wire_format import MEDIA_TYPES, WireFormat, encode_crossword, negotiate_format
 
-app = FastAPI(title="Crossword Generator API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open pooled LLM clients on startup; release them and worker pools on shutdown"""
+    await LLMService.startup()
+    yield
+    await LLMService.shutdown()
+    generation_executor.shutdown()
+    shutdown_process_pool()
+    clue_storage.close()
+
+app = FastAPI(title="Crossword Generator API", version="1.0.0", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -20,24 +41,97 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage with UUIDs
-clue_storage: Dict[str, Dict[str, str]] = {}
+# Per-request phase spans in a Server-Timing header, optionally logged as JSON
+if os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes"):
+    app.add_middleware(ServerTimingMiddleware, log=os.getenv("TIMING_LOG", "false").lower() in ("1", "true", "yes"))
+
+# Outermost, so CORS handling is included in request timings
+app.add_middleware(MetricsMiddleware)
+
+# Clue sessions keyed by UUID: bounded in-memory by default, or a SQLite
+# file shared by every worker on the node (SESSION_STORE=sqlite)
+clue_storage = create_session_store()
+
+# Serialized /generate-crossword responses keyed by canonical request
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+    max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+)
+
+# Crossword generation is CPU-bound, so it runs on a bounded worker pool
+# rather than blocking the event loop
+generation_executor = GenerationExecutor(
+    kind=os.getenv("GENERATION_EXECUTOR", "thread"),
+    # 0 means size to the available cores / allow 4 jobs per worker
+    max_workers=int(os.getenv("GENERATION_WORKERS", "0")) or None,
+    max_queue=int(os.getenv("GENERATION_MAX_QUEUE", "0")) or None
+)
+GENERATION_RETRY_AFTER = os.getenv("GENERATION_RETRY_AFTER", "1")
+# Applied to requests without their own deadline_ms (0 = no limit), so a
+# large word list cannot hold a worker indefinitely
+GENERATION_DEADLINE_MS = int(os.getenv("GENERATION_DEADLINE_MS", "5000")) or None
+
+# Values the caches and pools already track, read only when /metrics is scraped
+registry.callback(
+    "cache_requests_total", "Cache lookups by cache and outcome", "counter", ("cache", "outcome"),
+    lambda: {
+        ("result", "hit"): result_cache.hits,
+        ("result", "miss"): result_cache.misses,
+        ("llm", "hit"): LLMService.cache.hits,
+        ("llm", "stale_hit"): LLMService.cache.stale_hits,
+        ("llm", "miss"): LLMService.cache.misses,
+    }
+)
+registry.callback(
+    "cache_entries", "Entries held by each cache", "gauge", ("cache",),
+    lambda: {
+        ("result",): result_cache.stats()["entries"],
+        ("llm",): LLMService.cache.stats()["entries"],
+        ("clue_storage",): clue_storage.stats()["entries"],
+    }
+)
+registry.callback(
+    "generation_in_flight", "Crossword generations running or queued", "gauge", (),
+    lambda: {(): generation_executor.in_flight}
+)
+registry.callback(
+    "llm_in_flight", "Distinct LLM provider calls in flight", "gauge", (),
+    lambda: {(): LLMService.stats()["in_flight"]}
+)
+registry.callback(
+    "llm_coalesced_calls_total", "Topic requests that joined an in-flight LLM call", "counter", (),
+    lambda: {(): LLMService.coalesced_calls}
+)
 
 @app.get("/health")
 async def health_check():
     """Health check for monitoring"""
-    return {"status": "healthy", "service": "crossword-generator"}
+    return {
+        "status": "healthy",
+        "service": "crossword-generator",
+        "result_cache": result_cache.stats(),
+        "clue_storage": clue_storage.stats(),
+        "llm": LLMService.stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for this worker process"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.post("/generate-from-topic", response_model=TopicWordsResponse)
 async def generate_words_from_topic(request: TopicRequest):
     """Generate words and clues, store session data"""
     try:
         # Generate words and clues from LLM
-        word_clue_data = await LLMService.generate_words_and_clues_from_topic(request.topic)
+        with span("llm"):
+            word_clue_data = await LLMService.generate_words_and_clues_from_topic(request.topic)
         
         # Store clues with session ID
         crossword_id = str(uuid.uuid4())
-        clue_storage[crossword_id] = {item['word']: item['clue'] for item in word_clue_data}
+        with span("store"):
+            await clue_storage.put_async(crossword_id, word_clue_data)
         
         # Return just the words for crossword generation
         words = [item['word'] for item in word_clue_data]
@@ -50,46 +144,179 @@ async def generate_words_from_topic(request: TopicRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate words: {str(e)}")
 
+async def run_generation(request: WordListRequest) -> CrosswordGrid:
+    """Generate on the worker pool, recording metrics and the generate span"""
+    with span("generate"):
+        crossword_grid, seconds = await generation_executor.run(timed_build_crossword, request)
+    record_build(request, crossword_grid, seconds)
+    return crossword_grid
+
+def serialize_crossword(crossword_grid: CrosswordGrid, strategy: str, fmt: str = "json") -> bytes:
+    with span("serialize"):
+        return encode_crossword(crossword_grid, strategy, fmt)
+
+def crossword_body_response(body: bytes, fmt: str) -> Response:
+    # The same URL can answer in several formats depending on Accept
+    return Response(content=body, media_type=MEDIA_TYPES[fmt], headers={"Vary": "Accept"})
+
+def with_default_deadline(request: WordListRequest) -> WordListRequest:
+    if request.deadline_ms is None and GENERATION_DEADLINE_MS is not None:
+        return request.model_copy(update={"deadline_ms": GENERATION_DEADLINE_MS})
+    return request
+
+def request_cache_key(request: WordListRequest, fmt: str = "json") -> str:
+    return crossword_cache_key(
+        request.words, request.grid_size, request.seed, request.strategy,
+        request.starts, request.deadline_ms, request.include_stats, request.max_words, fmt
+    )
+
 @app.post("/generate-crossword", response_model=CrosswordResponse) 
-async def generate_crossword(request: WordListRequest):
-    """Create crossword from word list"""
+async def generate_crossword(request: WordListRequest,
+                             wire_format: Optional[WireFormat] = Query(default=None, alias="format"),
+                             accept: Optional[str] = Header(default=None)):
+    """Create crossword from word list
+    
+    ?format=rows|placements, or the matching Accept media type, selects a
+    compact encoding instead of the CrosswordResponse JSON.
+    """
+    fmt = negotiate_format(wire_format, accept)
     try:
         if not request.words:
             raise HTTPException(status_code=400, detail="No words provided")
         
-        # Generate crossword
-        generator = CrosswordGenerator(request.words)
-        crossword_grid = generator.generate_crossword()
+        request = with_default_deadline(request)
+        cache_key = request_cache_key(request, fmt)
+        with span("cache"):
+            body = result_cache.get(cache_key)
         
-        # Convert word placements to serializable format
-        word_placements_dict = []
-        for wp in crossword_grid.word_placements:
-            word_placements_dict.append({
-                "word": wp.word,
-                "start_row": wp.start_row,
-                "start_col": wp.start_col,
-                "direction": wp.direction.value,
-                "clue": wp.clue,
-                "number": wp.number
-            })
+        if body is None:
+            crossword_grid = await run_generation(request)
+            body = serialize_crossword(crossword_grid, request.strategy, fmt)
+            # A layout cut off by its deadline depends on load, so only
+            # finished searches are cached
+            if crossword_grid.completed:
+                result_cache.put(cache_key, body)
         
-        return CrosswordResponse(
-            grid=crossword_grid.grid,
-            word_placements=word_placements_dict,
-            width=crossword_grid.width,
-            height=crossword_grid.height
-        )
+        return crossword_body_response(body, fmt)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Crossword generation is busy, try again shortly",
+            headers={"Retry-After": GENERATION_RETRY_AFTER}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate crossword: {str(e)}")
 
+@app.post("/generate-batch")
+async def generate_batch(request: BatchRequest,
+                         wire_format: Optional[WireFormat] = Query(default=None, alias="format"),
+                         accept: Optional[str] = Header(default=None)):
+    """Generate many crosswords, streaming one NDJSON line per item as each finishes
+    
+    Each line's crossword uses the format selected as for /generate-crossword.
+    """
+    fmt = negotiate_format(wire_format, accept)
+    return StreamingResponse(batch_results(request.items, fmt), media_type="application/x-ndjson")
+
+async def batch_results(raw_items: List[Dict[str, Any]], fmt: str = "json") -> AsyncIterator[bytes]:
+    """Cached items first, then the rest in completion order; failures are reported per item"""
+    pending = []
+    cache_keys = {}
+    items = {}
+    
+    for index, raw_item in enumerate(raw_items):
+        try:
+            item = with_default_deadline(WordListRequest.model_validate(raw_item))
+        except ValidationError as e:
+            yield batch_error(index, f"Invalid item: {validation_detail(e)}")
+            continue
+        items[index] = item
+        
+        if not item.words:
+            yield batch_error(index, "No words provided")
+            continue
+        
+        cache_keys[index] = request_cache_key(item, fmt)
+        body = result_cache.get(cache_keys[index])
+        if body is None:
+            pending.append((index, item))
+        else:
+            yield batch_line(index, body)
+    
+    async for index, result, error in generation_executor.map_unordered(timed_build_crossword, pending):
+        if error is not None:
+            yield batch_error(index, f"Failed to generate crossword: {str(error)}")
+            continue
+        
+        crossword_grid, seconds = result
+        record_build(items[index], crossword_grid, seconds)
+        body = encode_crossword(crossword_grid, items[index].strategy, fmt)
+        if crossword_grid.completed:
+            result_cache.put(cache_keys[index], body)
+        yield batch_line(index, body)
+
+def batch_line(index: int, body: bytes) -> bytes:
+    # The cached response body is embedded as-is rather than re-serialized
+    return b'{"index":%d,"status":"ok","crossword":%s}\n' % (index, body)
+
+def batch_error(index: int, detail: str) -> bytes:
+    return json.dumps({"index": index, "status": "error", "detail": detail}).encode() + b"\n"
+
+def validation_detail(error: ValidationError) -> str:
+    """One-line summary of a ValidationError, e.g. 'grid_size: Input should be ...'"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+@app.post("/generate-puzzle", response_model=CrosswordResponse)
+async def generate_puzzle(request: PuzzleRequest,
+                          wire_format: Optional[WireFormat] = Query(default=None, alias="format"),
+                          accept: Optional[str] = Header(default=None)):
+    """Generate words, crossword and clues for a topic in one round trip"""
+    fmt = negotiate_format(wire_format, accept)
+    try:
+        with span("llm"):
+            # With streaming on, start on the grid once enough words arrived
+            word_clue_data = await LLMService.generate_words_and_clues_from_topic(
+                request.topic, min_words=LLMService.config()["stream_min_words"]
+            )
+        clues = {item['word']: item['clue'] for item in word_clue_data}
+        
+        word_request = with_default_deadline(
+            WordListRequest(words=list(clues), **request.model_dump(exclude={"topic"}))
+        )
+        crossword_grid = await run_generation(word_request)
+        attach_clues(crossword_grid, clues)
+        
+        body = serialize_crossword(crossword_grid, request.strategy, fmt)
+        return crossword_body_response(body, fmt)
+        
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Crossword generation is busy, try again shortly",
+            headers={"Retry-After": GENERATION_RETRY_AFTER}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate puzzle: {str(e)}")
+
+def attach_clues(crossword_grid: CrosswordGrid, clues: Dict[str, str]) -> None:
+    """Fill in each placement's clue from a word -> clue mapping"""
+    for wp in crossword_grid.word_placements:
+        wp.clue = clues.get(wp.word, "")
+
 @app.get("/clues/{crossword_id}", response_model=CluesResponse)
 async def get_clues(crossword_id: str):
     """Retrieve stored clues by session ID"""
-    if crossword_id not in clue_storage:
+    clues = await clue_storage.get_async(crossword_id)
+    if clues is None:
         raise HTTPException(status_code=404, detail="Crossword ID not found")
     
-    return CluesResponse(clues=clue_storage[crossword_id])
+    return CluesResponse(clues=clues)
 
 if __name__ == "__main__":
     import uvicorn
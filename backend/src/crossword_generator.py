@@ -1,55 +1,213 @@
+import math
 import random
-from typing import List, Optional, Tuple, Set
+import time
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 from models import WordPlacement, CrosswordGrid, Direction
+from grid_state import Alphabet, GridState, ANY_LETTER
+from generation_stats import GenerationStats
+
+# Default word target; pass max_words=None to place as many words as fit
+MAX_WORDS = 12
+
+STRATEGIES = ("greedy", "backtrack")
+
+# Largest automatic grid, matching GenerationOptions.grid_size
+MAX_GRID_SIZE = 41
+# Grid cells allowed per letter when sizing automatically; crosswords built
+# by anchored placement fill roughly a third of their square
+CELLS_PER_LETTER = 3.0
+# Smallest automatic grid; short lists need slack around the first word to
+# place as many words as they did on the old fixed 15x15 grid, and the
+# result is trimmed to the placed words either way
+MIN_AUTO_GRID_SIZE = 15
+
+# Default budget of can_place_word calls for the backtracking search
+MAX_CHECKS = 50000
+
+# Remaining words with a valid placement the backtracking search collects per
+# node, taken in placement order; checking every word would spend the whole
+# check budget on a few nodes for long lists
+FORWARD_CHECK_WORDS = 8
+
+# Anchored placements the greedy strategy draws per word before giving up on
+# it, so the cost per word stays flat as the grid fills
+ATTEMPTS_PER_WORD = 64
+
+def normalize_words(words: List[str]) -> List[str]:
+    """Uppercase and strip words, dropping anything shorter than 3 letters or non-alphabetic"""
+    return [word.upper().strip() for word in words if len(word.strip()) >= 3 and word.strip().isalpha()]
+
+def auto_grid_size(words: List[str], max_words: Optional[int] = MAX_WORDS) -> int:
+    """Side of a square grid with room for the words the search will try first
+    
+    The area is scaled from the letters in the longest max_words words,
+    since those are placed first, and the side is never shorter than the
+    longest word or MIN_AUTO_GRID_SIZE.
+    """
+    lengths = sorted((len(word) for word in set(words)), reverse=True)
+    if not lengths:
+        return MIN_AUTO_GRID_SIZE
+    if max_words is not None:
+        lengths = lengths[:max_words]
+    
+    side = math.ceil(math.sqrt(sum(lengths) * CELLS_PER_LETTER))
+    return min(MAX_GRID_SIZE, max(MIN_AUTO_GRID_SIZE, lengths[0], side))
 
 class CrosswordGenerator:
-    def __init__(self, words: List[str], grid_size: int = 15):
-        self.words = [word.upper().strip() for word in words if len(word.strip()) >= 3 and word.strip().isalpha()]
-        self.grid_size = grid_size
+    def __init__(self, words: List[str], grid_size: Optional[int] = None, strategy: str = "greedy",
+                 seed: Optional[int] = None, max_nodes: int = 2000, max_checks: int = MAX_CHECKS,
+                 deadline_ms: Optional[int] = None, max_words: Optional[int] = MAX_WORDS,
+                 stats: Optional[GenerationStats] = None):
+        setup_start = time.perf_counter()
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}")
+        
+        # Canonical order, so the layout for a seed does not depend on the
+        # order the caller listed the words in
+        self.words = sorted(normalize_words(words))
+        # Working grid; the finished crossword is trimmed to the placed words
+        self.grid_size = grid_size if grid_size is not None else auto_grid_size(self.words, max_words)
+        self.strategy = strategy
+        # Private RNG so a (words, grid_size, seed, strategy) tuple always
+        # reproduces the same layout; a seed is drawn when none is given so
+        # every result can still be regenerated
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.random = random.Random(self.seed)
+        # Search budget: nodes for the backtracking strategy, and a wall-clock
+        # limit per generate_crossword call for either strategy, after which
+        # the best layout so far is returned with completed=False
+        self.max_nodes = max_nodes
+        # Placement checks the backtracking search may spend forward checking;
+        # each node checks several remaining words, so nodes alone do not bound it
+        self.max_checks = max_checks
+        # Word target: the search stops once this many words are placed;
+        # None keeps going until no remaining word fits
+        self.max_words = max_words
+        self.deadline_ms = deadline_ms
+        self._deadline: Optional[float] = None
+        self.timed_out = False
         self.word_set = set(self.words)
+        # Grid cells hold letter codes, so words are encoded once up front
+        self.alphabet = Alphabet(sorted(set(''.join(self.words))))
+        self.encoded_words: Dict[str, bytes] = {word: self.alphabet.encode(word) for word in self.word_set}
+        self.encoded_word_set = set(self.encoded_words.values())
+        # (letters before, letters after) -> mask of letters that complete a
+        # word between them; drives the per-cell cross-check masks
+        self.cross_check_patterns = self._build_cross_check_patterns()
+        # Word -> letter -> offsets, and how many letter matches each word has
+        # with the rest of the list; built once so ordering and intersection
+        # queries never rescan the strings
+        self.letter_offsets, self.connectivity = self._build_intersection_table()
+        # Optional diagnostics; None keeps every hot-path check to one compare
+        self.stats = stats
+        if stats is not None:
+            stats.phase_ms["setup"] = (time.perf_counter() - setup_start) * 1000
+    
+    @staticmethod
+    def _index_letters(word: str) -> Dict[str, Tuple[int, ...]]:
+        """Map each letter of word to the offsets where it occurs"""
+        offsets: Dict[str, List[int]] = {}
+        for i, char in enumerate(word):
+            offsets.setdefault(char, []).append(i)
+        return {char: tuple(positions) for char, positions in offsets.items()}
+    
+    def _build_intersection_table(self) -> Tuple[Dict[str, Dict[str, Tuple[int, ...]]], Dict[str, int]]:
+        """Build the letter -> offsets index and connectivity scores in one pass"""
+        letter_offsets = {}
+        letter_totals: Dict[str, int] = {}
+        
+        for word in dict.fromkeys(self.words):
+            offsets = self._index_letters(word)
+            letter_offsets[word] = offsets
+            for char, positions in offsets.items():
+                letter_totals[char] = letter_totals.get(char, 0) + len(positions)
+        
+        # Number of (i, j) letter matches a word has with every other word
+        connectivity = {}
+        for word, offsets in letter_offsets.items():
+            connectivity[word] = sum(
+                len(positions) * (letter_totals[char] - len(positions))
+                for char, positions in offsets.items()
+            )
         
+        return letter_offsets, connectivity
+    
+    def _build_cross_check_patterns(self) -> Dict[Tuple[bytes, bytes], int]:
+        """Index every word by each single-letter gap it can fill"""
+        patterns: Dict[Tuple[bytes, bytes], int] = {}
+        for encoded in self.encoded_word_set:
+            for i, code in enumerate(encoded):
+                key = (encoded[:i], encoded[i + 1:])
+                patterns[key] = patterns.get(key, 0) | (1 << (code - 1))
+        return patterns
+    
     def find_intersections(self, word1: str, word2: str) -> List[Tuple[int, int]]:
         """Find all possible intersection points between two words"""
+        offsets2 = self.letter_offsets.get(word2) or self._index_letters(word2)
+        
         intersections = []
-        for i, char1 in enumerate(word1):
-            for j, char2 in enumerate(word2):
-                if char1 == char2:
-                    intersections.append((i, j))
+        for i, char in enumerate(word1):
+            for j in offsets2.get(char, ()):
+                intersections.append((i, j))
         return intersections
     
-    def can_place_word(self, grid: List[List[Optional[str]]], word: str, 
+    def new_grid(self) -> GridState:
+        """Create an empty grid sharing this generator's alphabet"""
+        return GridState(self.grid_size, self.alphabet)
+    
+    def _encode(self, word: str) -> bytes:
+        encoded = self.encoded_words.get(word)
+        if encoded is None:
+            encoded = self.alphabet.encode(word)
+        return encoded
+    
+    def can_place_word(self, grid: GridState, word: str, 
                       start_row: int, start_col: int, direction: Direction) -> bool:
         """Check if word can be placed WITHOUT creating invalid perpendicular words"""
-        if start_row < 0 or start_col < 0:
-            return False
-            
+        stats = self.stats
+        if stats is not None:
+            stats.can_place_calls += 1
+            stats.word_attempts[word] = stats.word_attempts.get(word, 0) + 1
+        
         # Check bounds
+        size = self.grid_size
         if direction == Direction.HORIZONTAL:
-            if start_col + len(word) > self.grid_size:
-                return False
-            if start_row >= self.grid_size:
-                return False
+            in_bounds = 0 <= start_row < size and 0 <= start_col and start_col + len(word) <= size
+            step = 1
         else:  # VERTICAL
-            if start_row + len(word) > self.grid_size:
-                return False
-            if start_col >= self.grid_size:
-                return False
+            in_bounds = 0 <= start_col < size and 0 <= start_row and start_row + len(word) <= size
+            step = size
+        
+        if not in_bounds:
+            if stats is not None:
+                stats.rejections["bounds"] += 1
+            return False
         
         # Check for conflicts and validate perpendicular words
-        for i, char in enumerate(word):
-            if direction == Direction.HORIZONTAL:
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
+        cells = grid.cells
+        checks = grid.horizontal_checks if direction == Direction.HORIZONTAL else grid.vertical_checks
+        index = start_row * size + start_col
+        for code in self._encode(word):
+            cell = cells[index]
             
             # Check if position conflicts with existing letter
-            if grid[row][col] is not None and grid[row][col] != char:
-                return False
+            if cell:
+                if cell != code:
+                    if stats is not None:
+                        stats.rejections["conflict"] += 1
+                    return False
             
             # Check perpendicular words only if this is a new letter placement
-            if grid[row][col] is None:
-                if not self._validate_perpendicular_placement(grid, row, col, char, direction):
+            else:
+                if stats is not None:
+                    stats.perpendicular_calls += 1
+                if not (checks[index] >> (code - 1)) & 1:
+                    if stats is not None:
+                        stats.rejections["perpendicular"] += 1
                     return False
+            
+            index += step
         
         # Check word boundaries - ensure no word merging
         if not self._check_word_boundaries(grid, word, start_row, start_col, direction):
@@ -57,95 +215,100 @@ class CrosswordGenerator:
             
         return True
     
-    def _validate_perpendicular_placement(self, grid: List[List[Optional[str]]], 
-                                        row: int, col: int, char: str, 
-                                        placement_direction: Direction) -> bool:
-        """Validate that placing a character doesn't create invalid perpendicular words"""
-        # Check perpendicular direction
-        perp_direction = Direction.VERTICAL if placement_direction == Direction.HORIZONTAL else Direction.HORIZONTAL
-        
-        if perp_direction == Direction.VERTICAL:
-            # Check vertical word formation
+    def _cross_check(self, grid: GridState, row: int, col: int, placement_direction: Direction) -> int:
+        """Compute the allowed-letter mask for an empty cell from its perpendicular run"""
+        cells = grid.cells
+        size = self.grid_size
+        
+        if placement_direction == Direction.HORIZONTAL:
+            # Letters directly above and below form a vertical word
             start_row = row
-            end_row = row
-            
-            # Find start of potential vertical word
-            while start_row > 0 and (grid[start_row - 1][col] is not None or start_row - 1 == row):
+            while start_row > 0 and cells[(start_row - 1) * size + col]:
                 start_row -= 1
-                if start_row == row:
-                    break
             
-            # Find end of potential vertical word
-            while end_row < self.grid_size - 1 and (grid[end_row + 1][col] is not None or end_row + 1 == row):
+            end_row = row
+            while end_row < size - 1 and cells[(end_row + 1) * size + col]:
                 end_row += 1
-                if end_row == row:
-                    break
             
-            # Build the potential word
-            if end_row > start_row:
-                word_chars = []
-                for r in range(start_row, end_row + 1):
-                    if r == row:
-                        word_chars.append(char)
-                    else:
-                        word_chars.append(grid[r][col])
-                
-                potential_word = ''.join(word_chars)
-                if len(potential_word) > 1 and potential_word not in self.word_set:
-                    return False
+            if end_row == start_row:
+                return ANY_LETTER
+            
+            key = (grid.col_slice(col, start_row, row), grid.col_slice(col, row + 1, end_row + 1))
         
-        else:  # Check horizontal word formation
+        else:
+            # Letters directly left and right form a horizontal word
             start_col = col
-            end_col = col
-            
-            # Find start of potential horizontal word
-            while start_col > 0 and (grid[row][start_col - 1] is not None or start_col - 1 == col):
+            while start_col > 0 and cells[row * size + start_col - 1]:
                 start_col -= 1
-                if start_col == col:
-                    break
             
-            # Find end of potential horizontal word
-            while end_col < self.grid_size - 1 and (grid[row][end_col + 1] is not None or end_col + 1 == col):
+            end_col = col
+            while end_col < size - 1 and cells[row * size + end_col + 1]:
                 end_col += 1
-                if end_col == col:
-                    break
             
-            # Build the potential word
-            if end_col > start_col:
-                word_chars = []
-                for c in range(start_col, end_col + 1):
-                    if c == col:
-                        word_chars.append(char)
-                    else:
-                        word_chars.append(grid[row][c])
-                
-                potential_word = ''.join(word_chars)
-                if len(potential_word) > 1 and potential_word not in self.word_set:
-                    return False
+            if end_col == start_col:
+                return ANY_LETTER
+            
+            key = (grid.row_slice(row, start_col, col), grid.row_slice(row, col + 1, end_col + 1))
         
-        return True
+        return self.cross_check_patterns.get(key, 0)
+    
+    def _update_cross_checks(self, grid: GridState, row: int, col: int) -> None:
+        """Refresh the masks of the empty cells bounding the runs through a new letter"""
+        cells = grid.cells
+        size = self.grid_size
+        
+        # Cells capping the vertical run constrain horizontal placements
+        top = row
+        while top > 0 and cells[(top - 1) * size + col]:
+            top -= 1
+        bottom = row
+        while bottom < size - 1 and cells[(bottom + 1) * size + col]:
+            bottom += 1
+        
+        if top > 0:
+            grid.set_check(grid.horizontal_checks, (top - 1) * size + col,
+                           self._cross_check(grid, top - 1, col, Direction.HORIZONTAL))
+        if bottom < size - 1:
+            grid.set_check(grid.horizontal_checks, (bottom + 1) * size + col,
+                           self._cross_check(grid, bottom + 1, col, Direction.HORIZONTAL))
+        
+        # Cells capping the horizontal run constrain vertical placements
+        left = col
+        while left > 0 and cells[row * size + left - 1]:
+            left -= 1
+        right = col
+        while right < size - 1 and cells[row * size + right + 1]:
+            right += 1
+        
+        if left > 0:
+            grid.set_check(grid.vertical_checks, row * size + left - 1,
+                           self._cross_check(grid, row, left - 1, Direction.VERTICAL))
+        if right < size - 1:
+            grid.set_check(grid.vertical_checks, row * size + right + 1,
+                           self._cross_check(grid, row, right + 1, Direction.VERTICAL))
     
-    def _check_word_boundaries(self, grid: List[List[Optional[str]]], word: str,
+    def _check_word_boundaries(self, grid: GridState, word: str,
                              start_row: int, start_col: int, direction: Direction) -> bool:
         """Check word boundaries to prevent word merging"""
+        cells = grid.cells
+        size = self.grid_size
+        
         if direction == Direction.HORIZONTAL:
-            # Check before word
-            if start_col > 0 and grid[start_row][start_col - 1] is not None:
-                return False
-            # Check after word
-            if start_col + len(word) < self.grid_size and grid[start_row][start_col + len(word)] is not None:
-                return False
+            # Check before word, then after word
+            merges = ((start_col > 0 and cells[start_row * size + start_col - 1]) or
+                      (start_col + len(word) < size and cells[start_row * size + start_col + len(word)]))
         else:  # VERTICAL
-            # Check before word
-            if start_row > 0 and grid[start_row - 1][start_col] is not None:
-                return False
-            # Check after word
-            if start_row + len(word) < self.grid_size and grid[start_row + len(word)][start_col] is not None:
-                return False
+            merges = ((start_row > 0 and cells[(start_row - 1) * size + start_col]) or
+                      (start_row + len(word) < size and cells[(start_row + len(word)) * size + start_col]))
         
-        return True
+        stats = self.stats
+        if stats is not None:
+            stats.boundary_calls += 1
+            if merges:
+                stats.rejections["boundary"] += 1
+        return not merges
     
-    def place_word(self, grid: List[List[Optional[str]]], word: str,
+    def place_word(self, grid: GridState, word: str,
                   start_row: int, start_col: int, direction: Direction) -> bool:
         """Place word on grid if possible"""
         if not self.can_place_word(grid, word, start_row, start_col, direction):
@@ -153,45 +316,139 @@ class CrosswordGenerator:
         
         for i, char in enumerate(word):
             if direction == Direction.HORIZONTAL:
-                grid[start_row][start_col + i] = char
+                row, col = start_row, start_col + i
             else:
-                grid[start_row + i][start_col] = char
+                row, col = start_row + i, start_col
+            
+            if not grid.get(row, col):
+                grid.set(row, col, char)
+                self._update_cross_checks(grid, row, col)
         
         return True
     
-    def _has_intersections(self, grid: List[List[Optional[str]]], word: str,
-                          start_row: int, start_col: int, direction: Direction) -> bool:
-        """Check if word placement has at least one intersection with existing words"""
-        intersection_count = 0
+    def find_candidate_placements(self, grid: GridState, word: str) -> List[Tuple[int, int, Direction]]:
+        """List placements where a letter of word lines up with a same-letter cell on the grid
         
-        for i, char in enumerate(word):
-            if direction == Direction.HORIZONTAL:
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
+        An anchor cell is only used in a direction where both of its
+        neighbours are empty: a cell already inside a run in that direction
+        cannot be crossed again without merging words, so skipping it keeps
+        the candidate list proportional to the open anchors rather than to
+        every letter on the grid.
+        """
+        candidates = []
+        seen = set()
+        size = self.grid_size
+        last_start = size - len(word)
+        cells = grid.cells
+        offsets = self.letter_offsets.get(word) or self._index_letters(word)
+        
+        for char, positions in offsets.items():
+            anchors = grid.letter_positions.get(char)
+            if not anchors:
+                continue
             
-            if grid[row][col] == char:
-                intersection_count += 1
+            for row, col in anchors:
+                index = row * size + col
+                open_across = not ((col > 0 and cells[index - 1]) or (col < size - 1 and cells[index + 1]))
+                open_down = not ((row > 0 and cells[index - size]) or (row < size - 1 and cells[index + size]))
+                
+                for i in positions:
+                    # Horizontal placement through the anchor
+                    if open_across and 0 <= col - i <= last_start:
+                        candidate = (row, col - i, Direction.HORIZONTAL)
+                        if candidate not in seen:
+                            seen.add(candidate)
+                            candidates.append(candidate)
+                    
+                    # Vertical placement through the anchor
+                    if open_down and 0 <= row - i <= last_start:
+                        candidate = (row - i, col, Direction.VERTICAL)
+                        if candidate not in seen:
+                            seen.add(candidate)
+                            candidates.append(candidate)
         
-        return intersection_count > 0
+        return candidates
+    
+    def sample_candidate_placements(self, grid: GridState, word: str, limit: int) -> Iterator[Tuple[int, int, Direction]]:
+        """Yield up to limit anchored placements in random order without listing them all
+        
+        Draws (anchor cell, letter offset) pairs uniformly without
+        replacement and places the word across the anchor's open direction,
+        skipping anchors already crossed and placements out of bounds, so
+        the work per word is bounded by limit however many letters are on
+        the grid.
+        """
+        size = self.grid_size
+        last_start = size - len(word)
+        cells = grid.cells
+        offsets = self.letter_offsets.get(word) or self._index_letters(word)
+        
+        groups = []
+        ends = []
+        total = 0
+        for char, positions in offsets.items():
+            anchors = grid.letter_positions.get(char)
+            if anchors:
+                total += len(anchors) * len(positions)
+                groups.append((anchors, positions))
+                ends.append(total)
+        
+        for draw in self.random.sample(range(total), min(total, limit)):
+            group = bisect_right(ends, draw)
+            anchors, positions = groups[group]
+            if group:
+                draw -= ends[group - 1]
+            
+            anchor, offset = divmod(draw, len(positions))
+            row, col = anchors[anchor]
+            i = positions[offset]
+            index = row * size + col
+            
+            # A letter inside a vertical run can only be crossed across, and
+            # vice versa; one with neighbours both ways is already crossed
+            if (row > 0 and cells[index - size]) or (row < size - 1 and cells[index + size]):
+                if 0 <= col - i <= last_start and not (
+                        (col > 0 and cells[index - 1]) or (col < size - 1 and cells[index + 1])):
+                    yield row, col - i, Direction.HORIZONTAL
+            elif 0 <= row - i <= last_start:
+                yield row - i, col, Direction.VERTICAL
+    
+    def _out_of_time(self) -> bool:
+        """True once the deadline has passed, remembering it for the result"""
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self.timed_out = True
+        return self.timed_out
     
     def generate_crossword(self) -> CrosswordGrid:
         """Main algorithm - must create VALID crosswords with proper connectivity"""
-        if not self.words:
+        self.timed_out = False
+        self._deadline = time.perf_counter() + self.deadline_ms / 1000 if self.deadline_ms is not None else None
+        
+        stats = self.stats
+        search_start = time.perf_counter()
+        
+        # Sort words by length (longer words first for better structure),
+        # breaking ties in favour of words with more letters to share and
+        # then alphabetically; words longer than the grid can never be placed
+        sorted_words = []
+        for word in sorted(self.words, key=lambda word: (-len(word), -self.connectivity[word], word)):
+            if len(word) <= self.grid_size:
+                sorted_words.append(word)
+            elif stats is not None:
+                stats.unplaced[word] = "too_long"
+        
+        if not sorted_words:
             return CrosswordGrid(
-                grid=[[None for _ in range(self.grid_size)] for _ in range(self.grid_size)],
-                width=self.grid_size,
-                height=self.grid_size,
-                word_placements=[]
+                grid=[],
+                width=0,
+                height=0,
+                word_placements=[],
+                seed=self.seed,
+                stats=stats
             )
         
         # Initialize empty grid
-        grid = [[None for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        word_placements = []
-        placed_words = set()
-        
-        # Sort words by length (longer words first for better structure)
-        sorted_words = sorted(self.words, key=len, reverse=True)
+        grid = self.new_grid()
         
         # Place first word in center
         first_word = sorted_words[0]
@@ -199,65 +456,212 @@ class CrosswordGenerator:
         center_col = (self.grid_size - len(first_word)) // 2
         
         self.place_word(grid, first_word, center_row, center_col, Direction.HORIZONTAL)
-        word_placements.append(WordPlacement(
-            word=first_word,
-            start_row=center_row,
-            start_col=center_col,
-            direction=Direction.HORIZONTAL,
-            number=1
-        ))
-        placed_words.add(first_word)
-        
-        # Try to place remaining words
-        attempts_per_word = 100
-        
-        for word in sorted_words[1:]:
+        placements = [(first_word, center_row, center_col, Direction.HORIZONTAL)]
+        
+        if self.strategy == "backtrack":
+            # Seed the search with the greedy layout so it can only improve on it
+            greedy_grid = self.new_grid()
+            self.place_word(greedy_grid, first_word, center_row, center_col, Direction.HORIZONTAL)
+            greedy = list(placements)
+            unplaced = dict(stats.unplaced) if stats is not None else None
+            self._search_greedy(greedy_grid, sorted_words, greedy)
+            if stats is not None:
+                # The search gives its own reasons for the words it leaves out
+                stats.unplaced = unplaced
+            
+            placements = self._search_backtrack(grid, sorted_words, placements, greedy)
+            
+            # The search leaves the grid wherever it stopped, so replay the
+            # best layout onto a fresh one, uncounted so stats describe the
+            # search alone
+            grid = self.new_grid()
+            self.stats = None
+            try:
+                for word, start_row, start_col, direction in placements:
+                    self.place_word(grid, word, start_row, start_col, direction)
+            finally:
+                self.stats = stats
+        else:
+            self._search_greedy(grid, sorted_words, placements)
+        
+        render_start = time.perf_counter()
+        
+        # Trim to the bounding box of the placed words, so the response
+        # carries no empty border rows or columns
+        top = min(start_row for _, start_row, _, _ in placements)
+        left = min(start_col for _, _, start_col, _ in placements)
+        bottom = max(start_row + (len(word) if direction == Direction.VERTICAL else 1)
+                     for word, start_row, _, direction in placements)
+        right = max(start_col + (len(word) if direction == Direction.HORIZONTAL else 1)
+                    for word, _, start_col, direction in placements)
+        
+        word_placements = [
+            WordPlacement(
+                word=word,
+                start_row=start_row - top,
+                start_col=start_col - left,
+                direction=direction,
+                number=number
+            )
+            for number, (word, start_row, start_col, direction) in enumerate(placements, start=1)
+        ]
+        
+        crossword = CrosswordGrid(
+            grid=grid.to_rows(top, left, bottom - top, right - left),
+            width=right - left,
+            height=bottom - top,
+            word_placements=word_placements,
+            seed=self.seed,
+            stats=stats,
+            completed=not self.timed_out
+        )
+        
+        if stats is not None:
+            placed_words = {word for word, _, _, _ in placements}
+            for word in sorted_words:
+                if word not in placed_words:
+                    stats.unplaced.setdefault(word, "not_selected")
+            stats.phase_ms["search"] = (render_start - search_start) * 1000
+            stats.phase_ms["render"] = (time.perf_counter() - render_start) * 1000
+        
+        return crossword
+    
+    def _search_greedy(self, grid: GridState, sorted_words: List[str],
+                       placements: List[Tuple[str, int, int, Direction]]) -> None:
+        """Place each word at its first valid anchored position, never revisiting a choice"""
+        placed_words = {word for word, _, _, _ in placements}
+        stats = self.stats
+        
+        # Try to place remaining words, probing only positions anchored on an
+        # existing same-letter cell so every candidate intersects the grid
+        for word in sorted_words:
             if word in placed_words:
                 continue
-                
-            placed = False
             
-            # Try to find intersections with already placed words
-            for attempt in range(attempts_per_word):
-                # Try both directions
-                for direction in [Direction.HORIZONTAL, Direction.VERTICAL]:
-                    # Try random positions, but prioritize intersections
-                    for _ in range(50):
-                        if direction == Direction.HORIZONTAL:
-                            start_row = random.randint(0, self.grid_size - 1)
-                            start_col = random.randint(0, max(0, self.grid_size - len(word)))
-                        else:
-                            start_row = random.randint(0, max(0, self.grid_size - len(word)))
-                            start_col = random.randint(0, self.grid_size - 1)
-                        
-                        if self.can_place_word(grid, word, start_row, start_col, direction):
-                            # Only place if it has intersections (connectivity requirement)
-                            if self._has_intersections(grid, word, start_row, start_col, direction):
-                                self.place_word(grid, word, start_row, start_col, direction)
-                                word_placements.append(WordPlacement(
-                                    word=word,
-                                    start_row=start_row,
-                                    start_col=start_col,
-                                    direction=direction,
-                                    number=len(word_placements) + 1
-                                ))
-                                placed_words.add(word)
-                                placed = True
-                                break
-                    
-                    if placed:
-                        break
-                
-                if placed:
+            if self._out_of_time():
+                break
+            
+            attempts = 0
+            for start_row, start_col, direction in self.sample_candidate_placements(grid, word, ATTEMPTS_PER_WORD):
+                attempts += 1
+                if self.place_word(grid, word, start_row, start_col, direction):
+                    placements.append((word, start_row, start_col, direction))
+                    placed_words.add(word)
                     break
+            else:
+                if stats is not None:
+                    stats.unplaced[word] = "rejected" if attempts else "no_anchor"
             
-            # Limit to reasonable number of words for quality
-            if len(word_placements) >= 12:
+            if self.max_words is not None and len(placements) >= self.max_words:
                 break
         
-        return CrosswordGrid(
-            grid=grid,
-            width=self.grid_size,
-            height=self.grid_size,
-            word_placements=word_placements
-        )
\ No newline at end of file
+        if stats is not None:
+            # Words never tried because the layout was full or time ran out
+            reason = "deadline" if self.timed_out else "word_limit"
+            for word in sorted_words:
+                if word not in placed_words:
+                    stats.unplaced.setdefault(word, reason)
+    
+    def _search_backtrack(self, grid: GridState, sorted_words: List[str],
+                          placements: List[Tuple[str, int, int, Direction]],
+                          best: List[Tuple[str, int, int, Direction]]) -> List[Tuple[str, int, int, Direction]]:
+        """Depth-first search for a layout fuller than best within the node and check budgets and deadline
+        
+        Branches on the most constrained of the first FORWARD_CHECK_WORDS
+        remaining words that still fit (fewest valid placements) and undoes
+        placements through the grid's undo log. Returns best unless a fuller
+        layout is found. Results are reproducible from the seed unless the
+        deadline is hit.
+        """
+        rank = {word: i for i, word in enumerate(dict.fromkeys(sorted_words))}
+        placed_words = {word for word, _, _, _ in placements}
+        best = list(best)
+        nodes = 0
+        checks = 0
+        exhausted = False
+        
+        def valid_placements(word: str) -> List[Tuple[int, int, Direction]]:
+            nonlocal checks
+            candidates = self.find_candidate_placements(grid, word)
+            checks += len(candidates)
+            return [candidate for candidate in candidates if self.can_place_word(grid, word, *candidate)]
+        
+        def search(remaining: List[str]) -> bool:
+            """Explore from the current grid; returns True once the search should stop"""
+            nonlocal best, nodes, exhausted
+            nodes += 1
+            if self.stats is not None:
+                self.stats.search_nodes = nodes
+            
+            if len(placements) > len(best):
+                best = list(placements)
+            if self.max_words is not None and len(best) >= self.max_words:
+                return True
+            if self._out_of_time():
+                return True
+            if nodes >= self.max_nodes or checks >= self.max_checks:
+                exhausted = True
+                return True
+            
+            # Every placed word adds anchors, so a word with no valid
+            # placement now may get one later: only the words left bound
+            # how far this branch can go
+            if len(placements) + len(remaining) <= len(best):
+                return False
+            
+            options = []
+            for word in remaining:
+                # Forward checking dominates each node, so the budgets are
+                # checked per word to keep overshoot small
+                if self._out_of_time():
+                    return True
+                if checks >= self.max_checks:
+                    exhausted = True
+                    return True
+                candidates = valid_placements(word)
+                if candidates:
+                    options.append((len(candidates), rank[word], word, candidates))
+                    if len(options) >= FORWARD_CHECK_WORDS:
+                        break
+            
+            # Nothing fits anywhere, so no word can be added below this node
+            if not options:
+                return False
+            
+            _, _, word, candidates = min(options)
+            rest = [other for other in remaining if other != word]
+            self.random.shuffle(candidates)
+            
+            for start_row, start_col, direction in candidates:
+                mark = grid.mark()
+                self.place_word(grid, word, start_row, start_col, direction)
+                placements.append((word, start_row, start_col, direction))
+                
+                if search(rest):
+                    return True
+                
+                placements.pop()
+                grid.rollback(mark)
+            
+            # Finally try the layouts that leave this word out
+            return search(rest)
+        
+        search([word for word in rank if word not in placed_words])
+        
+        if self.stats is not None:
+            # Words a fuller layout might still have fitted, had the search
+            # not stopped early
+            if self.timed_out:
+                reason = "deadline"
+            elif self.max_words is not None and len(best) >= self.max_words:
+                reason = "word_limit"
+            elif exhausted:
+                reason = "budget"
+            else:
+                reason = None
+            if reason is not None:
+                best_words = {word for word, _, _, _ in best}
+                for word in sorted_words:
+                    if word not in best_words:
+                        self.stats.unplaced.setdefault(word, reason)
+        return best
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from crossword_generator import CrosswordGenerator, normalize_words
+from generation_stats import GenerationStats
+from models import CrosswordGrid, WordListRequest
+from metrics import record_generation
+from multi_start import available_cores, generate_best_crossword, run_starts_sequentially
+
+EXECUTOR_KINDS = ("thread", "process")
+
+class ExecutorSaturated(Exception):
+    """Raised when too many generations are already queued or running"""
+
+def build_crossword(request: WordListRequest) -> CrosswordGrid:
+    """Generate a crossword, optionally keeping the best of several runs"""
+    if request.starts > 1:
+        return generate_best_crossword(
+            request.words,
+            grid_size=request.grid_size,
+            strategy=request.strategy,
+            starts=request.starts,
+            deadline_ms=request.deadline_ms,
+            seed=request.seed,
+            max_words=request.max_words,
+            include_stats=request.include_stats
+        )
+
+    generator = CrosswordGenerator(
+        request.words,
+        grid_size=request.grid_size,
+        strategy=request.strategy,
+        seed=request.seed,
+        deadline_ms=request.deadline_ms,
+        max_words=request.max_words,
+        stats=GenerationStats() if request.include_stats else None
+    )
+    return generator.generate_crossword()
+
+def timed_build_crossword(request: WordListRequest) -> Tuple[CrosswordGrid, float]:
+    """build_crossword plus the seconds it took on the worker"""
+    start = time.perf_counter()
+    crossword = build_crossword(request)
+    return crossword, time.perf_counter() - start
+
+def record_build(request: WordListRequest, crossword: CrosswordGrid, seconds: float) -> None:
+    """Report a finished generation to the metrics registry"""
+    requested = len(set(normalize_words(request.words)))
+    record_generation(request.strategy, seconds, requested, len(crossword.word_placements))
+
+class GenerationExecutor:
+    """Bounded pool that runs CPU-bound generation off the asyncio event loop
+
+    in_flight counts jobs that are running or waiting for a worker; once it
+    reaches max_queue new jobs are refused with ExecutorSaturated instead of
+    piling up behind a slow one. The counter is only touched from the event
+    loop, so it needs no lock.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {', '.join(EXECUTOR_KINDS)}")
+
+        self.kind = kind
+        self.max_workers = max_workers or available_cores()
+        self.max_queue = max_queue if max_queue is not None else self.max_workers * 4
+        self.in_flight = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # Workers run multi-start runs themselves rather than each
+                # opening a nested process pool
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=run_starts_sequentially)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="generation")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on a worker, raising ExecutorSaturated if the queue is full"""
+        if self.in_flight >= self.max_queue:
+            raise ExecutorSaturated(f"{self.in_flight} generations already in flight")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def map_unordered(self, fn: Callable[[Any], Any],
+                            items: Iterable[Tuple[int, Any]]) -> AsyncIterator[Tuple[int, Any, Optional[BaseException]]]:
+        """Run fn(item) for each (key, item), yielding (key, result, error) in completion order
+
+        At most max_workers of these jobs run at once. They count toward
+        in_flight but wait for a free worker rather than being refused, so a
+        large batch cannot crowd out single requests. Jobs not yet finished
+        are cancelled if the caller stops iterating.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        items = iter(items)
+        keys: Dict[asyncio.Future, int] = {}
+        pending: Set[asyncio.Future] = set()
+
+        try:
+            while True:
+                for key, item in items:
+                    future = loop.run_in_executor(executor, fn, item)
+                    keys[future] = key
+                    pending.add(future)
+                    self.in_flight += 1
+                    # Released however the job ends: yielded, cancelled, or
+                    # finished but never yielded because the caller stopped
+                    future.add_done_callback(self._release)
+                    if len(pending) >= self.max_workers:
+                        break
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception()
+                    yield keys.pop(future), None if error else future.result(), error
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _release(self, future: asyncio.Future) -> None:
+        self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
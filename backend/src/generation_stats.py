@@ -0,0 +1,44 @@
+from typing import Dict, Union
+
+# Why can_place_word turned a placement down
+REJECTION_REASONS = ("bounds", "conflict", "perpendicular", "boundary")
+
+class GenerationStats:
+    """Counters and phase timings collected by one CrosswordGenerator run
+
+    Pass an instance as CrosswordGenerator(stats=...) to explain a sparse
+    layout. The generator only touches it behind an `is not None` check, so
+    the default of no stats leaves the hot path unchanged.
+    """
+    __slots__ = ("can_place_calls", "perpendicular_calls", "boundary_calls", "rejections",
+                 "word_attempts", "unplaced", "phase_ms", "search_nodes")
+
+    def __init__(self):
+        self.can_place_calls = 0
+        self.perpendicular_calls = 0
+        self.boundary_calls = 0
+        self.rejections: Dict[str, int] = {reason: 0 for reason in REJECTION_REASONS}
+        # Word -> can_place_word calls made for it
+        self.word_attempts: Dict[str, int] = {}
+        # Word left out of the layout -> why: no_anchor (no letter in common
+        # with the grid when it was tried), rejected (every anchored
+        # placement failed), word_limit (max_words reached first), deadline
+        # (time ran out first), budget (the backtracking search used up
+        # max_nodes or max_checks first), not_selected (the backtracking
+        # search kept a layout without it) or too_long (longer than the grid)
+        self.unplaced: Dict[str, str] = {}
+        # Phase -> milliseconds: setup (indexes built in __init__), search, render
+        self.phase_ms: Dict[str, float] = {}
+        self.search_nodes = 0
+
+    def to_dict(self) -> Dict[str, Union[int, Dict]]:
+        return {
+            "can_place_calls": self.can_place_calls,
+            "perpendicular_calls": self.perpendicular_calls,
+            "boundary_calls": self.boundary_calls,
+            "rejections": dict(self.rejections),
+            "word_attempts": dict(self.word_attempts),
+            "unplaced": dict(self.unplaced),
+            "phase_ms": {phase: round(ms, 3) for phase, ms in self.phase_ms.items()},
+            "search_nodes": self.search_nodes,
+        }
@@ -0,0 +1,126 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EMPTY = 0
+# Distinct letters a grid can hold, since each cell is one byte and 0 is empty
+MAX_LETTERS = 255
+# Cross-check mask for a cell with no perpendicular neighbours
+ANY_LETTER = -1
+
+class Alphabet:
+    """Two-way mapping between letters and the 1-255 codes stored in a GridState"""
+
+    def __init__(self, letters: Iterable[str] = ()):
+        # Code 0 is reserved for empty cells
+        self.letters: List[Optional[str]] = [None]
+        self.codes: Dict[str, int] = {}
+        for char in letters:
+            self.code(char)
+
+    def code(self, char: str) -> int:
+        """Return the code for char, assigning the next free one if it is new"""
+        code = self.codes.get(char)
+        if code is None:
+            code = len(self.letters)
+            if code > MAX_LETTERS:
+                raise ValueError(f"Alphabet is limited to {MAX_LETTERS} distinct letters")
+            self.codes[char] = code
+            self.letters.append(char)
+        return code
+
+    def encode(self, word: str) -> bytes:
+        """Encode a word as a string of letter codes"""
+        return bytes(self.code(char) for char in word)
+
+    def decode(self, codes: bytes) -> str:
+        """Decode letter codes back into a word"""
+        return ''.join(self.letters[code] for code in codes)
+
+class GridState:
+    """Square crossword grid stored as one byte per cell, 0 meaning empty"""
+    __slots__ = ("size", "cells", "alphabet", "letter_positions", "horizontal_checks", "vertical_checks", "undo_log", "marks")
+
+    def __init__(self, size: int, alphabet: Alphabet):
+        self.size = size
+        self.cells = bytearray(size * size)
+        self.alphabet = alphabet
+        # Letter -> occupied (row, col) cells, kept current by set()
+        self.letter_positions: Dict[str, List[Tuple[int, int]]] = {}
+        # Per-cell bitmasks (bit code - 1) of letters that may be written there
+        # as part of a horizontal / vertical word without forming an invalid
+        # perpendicular run; maintained by the generator as words are placed
+        self.horizontal_checks: List[int] = [ANY_LETTER] * (size * size)
+        self.vertical_checks: List[int] = [ANY_LETTER] * (size * size)
+        # (mask list or None for a cell write, index, previous mask or letter),
+        # recorded only while a mark is active so greedy runs keep it empty
+        self.undo_log: List[Tuple[Optional[List[int]], int, object]] = []
+        # Undo log lengths of the marks not yet rolled back, innermost last
+        self.marks: List[int] = []
+
+    def get(self, row: int, col: int) -> int:
+        """Letter code at a cell, EMPTY if nothing is placed there"""
+        return self.cells[row * self.size + col]
+
+    def letter_at(self, row: int, col: int) -> Optional[str]:
+        return self.alphabet.letters[self.cells[row * self.size + col]]
+
+    def set(self, row: int, col: int, char: str) -> None:
+        """Write a letter into an empty cell and index its position"""
+        index = row * self.size + col
+        self.cells[index] = self.alphabet.code(char)
+        self.letter_positions.setdefault(char, []).append((row, col))
+        if self.marks:
+            self.undo_log.append((None, index, char))
+
+    def set_check(self, checks: List[int], index: int, mask: int) -> None:
+        """Update one cross-check mask, remembering the previous value"""
+        if self.marks:
+            self.undo_log.append((checks, index, checks[index]))
+        checks[index] = mask
+
+    def mark(self) -> int:
+        """Checkpoint to pass to rollback(); writes are logged until it is rolled back"""
+        mark = len(self.undo_log)
+        self.marks.append(mark)
+        return mark
+
+    def rollback(self, mark: int) -> None:
+        """Undo every cell write and mask update made since mark"""
+        # Also drops inner marks a caller abandoned without rolling back
+        marks = self.marks
+        while marks and marks[-1] >= mark:
+            marks.pop()
+        undo_log = self.undo_log
+        while len(undo_log) > mark:
+            checks, index, value = undo_log.pop()
+            if checks is None:
+                self.cells[index] = EMPTY
+                # Writes are undone in reverse order, so the cell is the
+                # most recent position recorded for its letter
+                self.letter_positions[value].pop()
+            else:
+                checks[index] = value
+
+    def row_slice(self, row: int, start: int, end: int) -> bytes:
+        """Letter codes of row between columns start (inclusive) and end (exclusive)"""
+        base = row * self.size
+        return bytes(self.cells[base + start:base + end])
+
+    def col_slice(self, col: int, start: int, end: int) -> bytes:
+        """Letter codes of col between rows start (inclusive) and end (exclusive)"""
+        return bytes(self.cells[start * self.size + col:end * self.size + col:self.size])
+
+    def to_rows(self, top: int = 0, left: int = 0, height: Optional[int] = None,
+                width: Optional[int] = None) -> List[List[Optional[str]]]:
+        """Convert to the nested list shape used by CrosswordGrid.grid
+        
+        top, left, height and width select a window of the grid, such as the
+        bounding box of the placed words; the whole grid by default.
+        """
+        letters = self.alphabet.letters
+        size = self.size
+        height = size - top if height is None else height
+        width = size - left if width is None else width
+        return [
+            [letters[code] for code in self.cells[row * size + left:row * size + left + width]]
+            for row in range(top, top + height)
+        ]
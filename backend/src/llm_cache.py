@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlite_support import ExpirySweep, write_transaction
+
+WordClues = List[Dict[str, str]]
+
+def normalize_topic(topic: str) -> str:
+    """Case- and whitespace-insensitive form of a topic"""
+    return " ".join(topic.lower().split())
+
+class LLMResponseCache:
+    """Two-tier cache of parsed LLM word/clue lists
+
+    An in-memory LRU sits in front of an optional SQLite file so results
+    survive restarts and are shared by every worker on the node. Entries are
+    fresh for ttl_seconds and may then be served stale for stale_seconds
+    more while the caller refreshes them.
+
+    At most once every sweep_interval seconds a put also deletes rows too
+    old to serve and the oldest rows beyond max_disk_entries, so the file
+    stays bounded however many distinct topics are requested.
+
+    A disk read or write can wait up to busy_timeout for another worker's
+    transaction, so callers on the event loop use get_async and put_async,
+    which answer memory hits inline and run the disk tier on a thread.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS llm_responses (
+            cache_key TEXT PRIMARY KEY,
+            stored_at REAL NOT NULL,
+            payload TEXT NOT NULL
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS llm_responses_stored_at ON llm_responses (stored_at)",
+    )
+    SELECT = "SELECT stored_at, payload FROM llm_responses WHERE cache_key = ?"
+    UPSERT = "INSERT OR REPLACE INTO llm_responses (cache_key, stored_at, payload) VALUES (?, ?, ?)"
+    DELETE = "DELETE FROM llm_responses"
+    SWEEP_EXPIRED = "DELETE FROM llm_responses WHERE stored_at <= ?"
+    SWEEP_OVERFLOW = """DELETE FROM llm_responses WHERE cache_key IN (
+        SELECT cache_key FROM llm_responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+    )"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400,
+                 stale_seconds: float = 0, path: Optional[str] = None,
+                 max_disk_entries: int = 10000, sweep_interval: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_disk_entries = max_disk_entries
+        self.sweep_interval = sweep_interval
+        # cache key -> (stored_at, word clues), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, WordClues]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Held for every statement, separately from _lock so memory hits
+        # never wait on a disk write that is waiting for another worker
+        self._disk_lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._sweeper: Optional[ExpirySweep] = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._sweeper = ExpirySweep(self._conn, self._disk_lock, sweep_interval, self._delete_expired)
+
+    @staticmethod
+    def key(topic: str, provider: str, prompt_version: str) -> str:
+        canonical = json.dumps([normalize_topic(topic), provider, prompt_version], separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[WordClues, bool]]:
+        """Return (word clues, is_stale), or None when missing or too old to serve"""
+        entry = self._recall(key)
+        if entry is None and self._conn is not None:
+            entry = self._load(key)
+        return self._serve(key, entry)
+
+    async def get_async(self, key: str) -> Optional[Tuple[WordClues, bool]]:
+        """get() for callers on the event loop; only a memory miss leaves the loop"""
+        entry = self._recall(key)
+        if entry is None and self._conn is not None:
+            entry = await asyncio.to_thread(self._load, key)
+        return self._serve(key, entry)
+
+    def put(self, key: str, word_clues: WordClues) -> None:
+        entry = (time.time(), word_clues)
+        with self._lock:
+            self._remember(key, entry)
+        if self._conn is not None:
+            self._store(key, entry)
+
+    async def put_async(self, key: str, word_clues: WordClues) -> None:
+        """put() for callers on the event loop; the disk write runs on a thread"""
+        entry = (time.time(), word_clues)
+        with self._lock:
+            self._remember(key, entry)
+        if self._conn is not None:
+            await asyncio.to_thread(self._store, key, entry)
+
+    def sweep(self) -> None:
+        """Delete expired and overflowing on-disk rows now"""
+        if self._sweeper is not None:
+            self._sweeper.sweep_now()
+
+    def _recall(self, key: str) -> Optional[Tuple[float, WordClues]]:
+        """Memory tier lookup"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _load(self, key: str) -> Optional[Tuple[float, WordClues]]:
+        """Disk tier lookup, promoting a found row into memory"""
+        with self._disk_lock:
+            row = self._conn.execute(self.SELECT, (key,)).fetchone()
+        if row is None:
+            return None
+
+        entry = (row[0], json.loads(row[1]))
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def _serve(self, key: str, entry: Optional[Tuple[float, WordClues]]) -> Optional[Tuple[WordClues, bool]]:
+        """Count a lookup and apply the fresh / stale windows"""
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, word_clues = entry
+            age = time.time() - stored_at
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return word_clues, False
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                return word_clues, True
+
+            self._memory.pop(key, None)
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, entry: Tuple[float, WordClues]) -> None:
+        """Write one row, sweeping in the same transaction when one is due"""
+        now, word_clues = entry
+        payload = json.dumps(word_clues)
+        with self._disk_lock:
+            if not self._sweeper.due(now):
+                self._conn.execute(self.UPSERT, (key, now, payload))
+                return
+
+            with write_transaction(self._conn):
+                self._conn.execute(self.UPSERT, (key, now, payload))
+                self._sweeper.run(now)
+
+    def _delete_expired(self, now: float) -> None:
+        self._conn.execute(self.SWEEP_EXPIRED, (now - self.ttl_seconds - self.stale_seconds,))
+        self._conn.execute(self.SWEEP_OVERFLOW, (self.max_disk_entries,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._conn.execute(self.DELETE)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: str, entry: Tuple[float, WordClues]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -1,12 +1,43 @@
 import os
 import re
+import json
+import time
 import asyncio
-from typing import List, Dict, Optional
+from contextlib import aclosing
+from functools import partial
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import httpx
 import openai
 import anthropic
+from llm_cache import LLMResponseCache
+from metrics import LLM_REQUEST_SECONDS, LLM_FALLBACKS
+from timing import span
+
+# Part of the response cache key; bump whenever create_prompt changes
+PROMPT_VERSION = "1"
 
 class LLMService:
+    # Parsed provider responses keyed by normalized topic, provider and prompt version
+    cache = LLMResponseCache(
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+        stale_seconds=float(os.getenv("LLM_CACHE_STALE_SECONDS", "0")),
+        path=os.getenv("LLM_CACHE_PATH") or None,
+        max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "10000"))
+    )
+    # Strong references to in-flight stale-while-revalidate refreshes
+    _refreshes: Dict[str, asyncio.Task] = {}
+    # Provider calls in flight by cache key; concurrent misses for the same
+    # key await the one task instead of each calling the provider
+    _in_flight: Dict[str, asyncio.Task] = {}
+    # Entries streamed so far by in-flight calls in streaming mode
+    _streams: Dict[str, "StreamedWords"] = {}
+    coalesced_calls = 0
+    # Config read once per process and provider clients reused for the app's
+    # lifetime, so requests skip TLS handshakes and connection pool setup
+    _config: Optional[Dict] = None
+    _clients: Dict[str, object] = {}
+    
     @staticmethod
     def get_config() -> Dict:
         """Environment-based LLM configuration"""
@@ -14,9 +45,92 @@ class LLMService:
             "provider": os.getenv("LLM_PROVIDER", "mock"),
             "openai_api_key": os.getenv("OPENAI_API_KEY"),
             "anthropic_api_key": os.getenv("ANTHROPIC_API_KEY"),
-            "ollama_base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+            "ollama_base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            "max_connections": int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            "max_keepalive_connections": int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            "keepalive_expiry": float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+            "streaming": os.getenv("LLM_STREAMING", "false").lower() in ("1", "true", "yes"),
+            # Streamed entries /generate-puzzle waits for before building the
+            # grid; the rest is still read and cached (0 = the whole response)
+            "stream_min_words": int(os.getenv("LLM_STREAM_MIN_WORDS", "0"))
         }
     
+    @staticmethod
+    def config() -> Dict:
+        """Configuration read from the environment on first use"""
+        if LLMService._config is None:
+            LLMService._config = LLMService.get_config()
+        return LLMService._config
+    
+    @staticmethod
+    async def startup() -> None:
+        """Read config and open the configured provider's client"""
+        config = LLMService.config()
+        if config["provider"] == "openai" and config["openai_api_key"]:
+            LLMService._get_openai_client(config)
+        elif config["provider"] == "anthropic" and config["anthropic_api_key"]:
+            LLMService._get_anthropic_client(config)
+        elif config["provider"] == "ollama":
+            LLMService._get_ollama_client(config)
+    
+    @staticmethod
+    async def shutdown() -> None:
+        """Close pooled clients and forget the cached config"""
+        clients = LLMService._clients
+        LLMService._clients = {}
+        LLMService._config = None
+        LLMService._in_flight = {}
+        LLMService._streams = {}
+        
+        for name, client in clients.items():
+            try:
+                if isinstance(client, httpx.AsyncClient):
+                    await client.aclose()
+                else:
+                    await client.close()
+            except Exception as e:
+                print(f"⚠️  Failed to close {name} client: {e}")
+    
+    @staticmethod
+    def _http_client(config: Dict, timeout: Optional[float] = None) -> httpx.AsyncClient:
+        """HTTP client with the configured pool limits and keep-alive"""
+        limits = httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"]
+        )
+        return httpx.AsyncClient(limits=limits, timeout=timeout)
+    
+    @staticmethod
+    def _get_openai_client(config: Dict) -> "openai.AsyncOpenAI":
+        client = LLMService._clients.get("openai")
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=config["openai_api_key"],
+                http_client=LLMService._http_client(config)
+            )
+            LLMService._clients["openai"] = client
+        return client
+    
+    @staticmethod
+    def _get_anthropic_client(config: Dict) -> "anthropic.AsyncAnthropic":
+        client = LLMService._clients.get("anthropic")
+        if client is None:
+            client = anthropic.AsyncAnthropic(
+                api_key=config["anthropic_api_key"],
+                http_client=LLMService._http_client(config)
+            )
+            LLMService._clients["anthropic"] = client
+        return client
+    
+    @staticmethod
+    def _get_ollama_client(config: Dict) -> httpx.AsyncClient:
+        client = LLMService._clients.get("ollama")
+        if client is None:
+            client = LLMService._http_client(config, timeout=30.0)
+            LLMService._clients["ollama"] = client
+        return client
+    
     @staticmethod
     def create_prompt(topic: str) -> str:
         return f"""You are helping create a crossword puzzle. Generate exactly 30 words with clues related to the topic "{topic}".
@@ -42,33 +156,191 @@ Now generate 30 words for the topic: "{topic}"
 """
 
     @staticmethod
-    async def generate_words_and_clues_from_topic(topic: str) -> List[Dict[str, str]]:
-        """Generate 30 words with clues in CSV format"""
-        config = LLMService.get_config()
+    async def generate_words_and_clues_from_topic(topic: str, min_words: int = 0) -> List[Dict[str, str]]:
+        """Generate 30 words with clues in CSV format
+        
+        In streaming mode with min_words set, returns the first min_words
+        entries as soon as they arrive; the response is still read to the
+        end in the background and cached complete.
+        """
+        config = LLMService.config()
         print(f"🔧 LLM_PROVIDER: {config['provider']}")
         
+        cache_key = LLMResponseCache.key(topic, config["provider"], PROMPT_VERSION)
+        cached = await LLMService._cached(topic, config, cache_key)
+        if cached is not None:
+            return cached
+        
+        task, stream = LLMService._join_fetch(topic, config, cache_key)
+        if min_words and stream is not None:
+            words_and_clues = []
+            async for entry in stream:
+                words_and_clues.append(dict(entry))
+                if len(words_and_clues) >= min_words:
+                    print(f"⏩ Continuing with {len(words_and_clues)} streamed words for '{topic}'")
+                    return words_and_clues
+        
+        # Shielded so a caller that disconnects does not cancel the call
+        # other requests are still waiting on
+        word_clues = await asyncio.shield(task)
+        return [dict(item) for item in word_clues]
+    
+    @staticmethod
+    async def stream_words_and_clues_from_topic(topic: str) -> AsyncIterator[Dict[str, str]]:
+        """Yield validated word/clue entries as soon as the provider streams each line
+        
+        The response is read by a background call shared with concurrent
+        requests for the topic, so a caller may stop iterating early and the
+        rest is still read and cached. Cache hits and buffered providers
+        yield the whole list at once. The entries are followed by the same
+        padding, or mock words if the stream fails, as the buffered path.
+        """
+        config = LLMService.config()
+        cache_key = LLMResponseCache.key(topic, config["provider"], PROMPT_VERSION)
+        cached = await LLMService._cached(topic, config, cache_key)
+        if cached is not None:
+            for entry in cached:
+                yield entry
+            return
+        
+        task, stream = LLMService._join_fetch(topic, config, cache_key)
+        yielded = 0
+        if stream is not None:
+            async for entry in stream:
+                yielded += 1
+                yield dict(entry)
+        
+        word_clues = await asyncio.shield(task)
+        for entry in word_clues[yielded:]:
+            yield dict(entry)
+    
+    @staticmethod
+    async def _cached(topic: str, config: Dict, cache_key: str) -> Optional[List[Dict[str, str]]]:
+        """Padded copy of a cached response, refreshing it in the background if stale"""
+        with span("llm_cache"):
+            cached = await LLMService.cache.get_async(cache_key)
+        if cached is None:
+            return None
+        
+        word_clues, stale = cached
+        print(f"💾 Cached {'(stale) ' if stale else ''}words for topic: {topic}")
+        if stale:
+            LLMService._schedule_refresh(topic, config, cache_key)
+        return LLMService._pad_words([dict(item) for item in word_clues])
+    
+    @staticmethod
+    def _join_fetch(topic: str, config: Dict, cache_key: str) -> Tuple[asyncio.Task, Optional["StreamedWords"]]:
+        """Start the provider call for a cache miss, or join the one already in flight"""
+        task = LLMService._in_flight.get(cache_key)
+        if task is None:
+            stream = StreamedWords() if config["streaming"] else None
+            task = asyncio.create_task(LLMService._fetch(topic, config, cache_key, stream))
+            LLMService._in_flight[cache_key] = task
+            if stream is not None:
+                LLMService._streams[cache_key] = stream
+            task.add_done_callback(partial(LLMService._forget_in_flight, cache_key))
+        else:
+            LLMService.coalesced_calls += 1
+            print(f"🔗 Joining in-flight request for topic: {topic}")
+        return task, LLMService._streams.get(cache_key)
+    
+    @staticmethod
+    async def _fetch(topic: str, config: Dict, cache_key: str,
+                     stream: Optional["StreamedWords"] = None) -> List[Dict[str, str]]:
+        """Call the provider once for a cache miss and cache a usable response"""
+        try:
+            if stream is not None:
+                word_clues = await LLMService._collect_stream(topic, config, stream)
+            else:
+                word_clues = await LLMService._call_provider(topic, config)
+        finally:
+            if stream is not None:
+                stream.close()
+        if word_clues is None:
+            # Fallback to mock data
+            return LLMService._get_mock_words(topic)
+        
+        # Cached as the provider returned it, unpadded for both the buffered
+        # and streamed paths; padding is added whenever it is served
+        await LLMService.cache.put_async(cache_key, [dict(item) for item in word_clues])
+        return LLMService._pad_words([dict(item) for item in word_clues])
+    
+    @staticmethod
+    def _forget_in_flight(cache_key: str, task: asyncio.Task) -> None:
+        """Drop a finished call so the next miss for its key starts a fresh one"""
+        if LLMService._in_flight.get(cache_key) is task:
+            del LLMService._in_flight[cache_key]
+            LLMService._streams.pop(cache_key, None)
+        # Mark the error as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    @staticmethod
+    def stats() -> Dict[str, object]:
+        return {
+            "cache": LLMService.cache.stats(),
+            "in_flight": len(LLMService._in_flight),
+            "coalesced_calls": LLMService.coalesced_calls
+        }
+    
+    @staticmethod
+    async def _call_provider(topic: str, config: Dict) -> Optional[List[Dict[str, str]]]:
+        """Call the configured provider, or return None if none is usable"""
+        if config["streaming"]:
+            return await LLMService._collect_stream(topic, config)
+        
+        start = time.perf_counter()
         try:
             if config["provider"] == "openai" and config["openai_api_key"]:
                 print(f"🚀 Using OpenAI for topic: {topic}")
-                return await LLMService._call_openai(topic, config)
+                call = LLMService._call_openai
             elif config["provider"] == "anthropic" and config["anthropic_api_key"]:
                 print(f"🚀 Using Anthropic for topic: {topic}")
-                return await LLMService._call_anthropic(topic, config)
+                call = LLMService._call_anthropic
             elif config["provider"] == "ollama":
                 print(f"🚀 Using Ollama for topic: {topic}")
-                return await LLMService._call_ollama(topic, config)
+                call = LLMService._call_ollama
             else:
                 print(f"⚠️  No valid LLM provider configured. Provider: {config['provider']}, Has API keys: OpenAI={bool(config['openai_api_key'])}, Anthropic={bool(config['anthropic_api_key'])}")
+                LLM_FALLBACKS.inc(config["provider"], LLMService._unconfigured_reason(config))
+                return None
+            
+            with span("llm_provider"):
+                word_clues = await call(topic, config)
         except Exception as e:
             print(f"❌ LLM call failed: {e}")
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, config["provider"], "error")
+            LLM_FALLBACKS.inc(config["provider"], "error")
+            return None
+        
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, config["provider"], "success")
+        return word_clues
+    
+    @staticmethod
+    def _unconfigured_reason(config: Dict) -> str:
+        """Fallback reason when no provider call is made"""
+        return "mock" if config["provider"] == "mock" else "unconfigured"
+    
+    @staticmethod
+    def _schedule_refresh(topic: str, config: Dict, cache_key: str) -> None:
+        """Refresh a stale cache entry in the background, once per key"""
+        if cache_key in LLMService._refreshes:
+            return
+        
+        async def refresh():
+            try:
+                word_clues = await LLMService._call_provider(topic, config)
+                if word_clues is not None:
+                    await LLMService.cache.put_async(cache_key, word_clues)
+            finally:
+                LLMService._refreshes.pop(cache_key, None)
         
-        # Fallback to mock data
-        return LLMService._get_mock_words(topic)
+        LLMService._refreshes[cache_key] = asyncio.create_task(refresh())
     
     @staticmethod
     async def _call_openai(topic: str, config: Dict) -> List[Dict[str, str]]:
         """OpenAI API integration"""
-        client = openai.AsyncOpenAI(api_key=config["openai_api_key"])
+        client = LLMService._get_openai_client(config)
         
         response = await client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -89,7 +361,7 @@ Now generate 30 words for the topic: "{topic}"
     @staticmethod
     async def _call_anthropic(topic: str, config: Dict) -> List[Dict[str, str]]:
         """Anthropic API integration"""
-        client = anthropic.AsyncAnthropic(api_key=config["anthropic_api_key"])
+        client = LLMService._get_anthropic_client(config)
         
         response = await client.messages.create(
             model="claude-opus-4-20250514",
@@ -109,43 +381,188 @@ Now generate 30 words for the topic: "{topic}"
     @staticmethod
     async def _call_ollama(topic: str, config: Dict) -> List[Dict[str, str]]:
         """Ollama API integration"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{config['ollama_base_url']}/api/generate",
-                json={
-                    "model": "llama2",
-                    "prompt": LLMService.create_prompt(topic),
-                    "stream": False
-                }
-            )
+        client = LLMService._get_ollama_client(config)
+        
+        response = await client.post(
+            f"{config['ollama_base_url']}/api/generate",
+            json={
+                "model": "llama2",
+                "prompt": LLMService.create_prompt(topic),
+                "stream": False
+            }
+        )
+        response.raise_for_status()
+        
+        content = response.json().get("response", "")
+        return LLMService._parse_csv_response(content)
+    
+    @staticmethod
+    async def _collect_stream(topic: str, config: Dict,
+                              stream: Optional["StreamedWords"] = None) -> Optional[List[Dict[str, str]]]:
+        """Read a streamed response to the end, publishing entries to stream as lines arrive
+        
+        Returns the complete, unpadded list (up to 30 entries). A stream
+        that fails part-way is treated like a failed call, so the partial
+        list is never cached.
+        """
+        chunks = LLMService._stream_provider(topic, config)
+        if chunks is None:
+            print(f"⚠️  No valid LLM provider configured. Provider: {config['provider']}")
+            LLM_FALLBACKS.inc(config["provider"], LLMService._unconfigured_reason(config))
+            return None
+        
+        words_and_clues = []
+        start = time.perf_counter()
+        try:
+            with span("llm_provider"):
+                async with aclosing(LLMService._stream_entries(chunks)) as entries:
+                    async for entry in entries:
+                        words_and_clues.append(entry)
+                        if stream is not None:
+                            stream.add(entry)
+        except Exception as e:
+            print(f"❌ LLM stream failed after {len(words_and_clues)} words: {e}")
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, config["provider"], "error")
+            LLM_FALLBACKS.inc(config["provider"], "error")
+            return None
+        
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, config["provider"], "success")
+        
+        print(f"📋 Streamed {len(words_and_clues)} words for '{topic}'")
+        return words_and_clues
+    
+    @staticmethod
+    async def _stream_entries(chunks: AsyncIterator[str]) -> AsyncIterator[Dict[str, str]]:
+        """Parse streamed text into at most 30 entries, closing the upstream stream when done"""
+        parser = CSVLineParser()
+        count = 0
+        
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                for entry in parser.feed(chunk):
+                    yield entry
+                    count += 1
+                    if count >= 30:
+                        return
+            
+            for entry in parser.close():
+                yield entry
+                count += 1
+                if count >= 30:
+                    return
+    
+    @staticmethod
+    def _stream_provider(topic: str, config: Dict) -> Optional[AsyncIterator[str]]:
+        """Text chunk stream from the configured provider, or None if none is usable"""
+        if config["provider"] == "openai" and config["openai_api_key"]:
+            print(f"🚀 Streaming OpenAI for topic: {topic}")
+            return LLMService._stream_openai(topic, config)
+        elif config["provider"] == "anthropic" and config["anthropic_api_key"]:
+            print(f"🚀 Streaming Anthropic for topic: {topic}")
+            return LLMService._stream_anthropic(topic, config)
+        elif config["provider"] == "ollama":
+            print(f"🚀 Streaming Ollama for topic: {topic}")
+            return LLMService._stream_ollama(topic, config)
+        return None
+    
+    @staticmethod
+    async def _stream_openai(topic: str, config: Dict) -> AsyncIterator[str]:
+        """OpenAI streaming integration"""
+        client = LLMService._get_openai_client(config)
+        
+        stream = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "user", "content": LLMService.create_prompt(topic)}
+            ],
+            max_tokens=2000,
+            temperature=0.7,
+            stream=True
+        )
+        
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        finally:
+            await stream.response.aclose()
+    
+    @staticmethod
+    async def _stream_anthropic(topic: str, config: Dict) -> AsyncIterator[str]:
+        """Anthropic streaming integration"""
+        client = LLMService._get_anthropic_client(config)
+        
+        async with client.messages.stream(
+            model="claude-opus-4-20250514",
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": LLMService.create_prompt(topic)}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    @staticmethod
+    async def _stream_ollama(topic: str, config: Dict) -> AsyncIterator[str]:
+        """Ollama streaming integration (newline-delimited JSON)"""
+        client = LLMService._get_ollama_client(config)
+        
+        async with client.stream(
+            "POST",
+            f"{config['ollama_base_url']}/api/generate",
+            json={
+                "model": "llama2",
+                "prompt": LLMService.create_prompt(topic),
+                "stream": True
+            }
+        ) as response:
             response.raise_for_status()
             
-            content = response.json().get("response", "")
-            return LLMService._parse_csv_response(content)
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data.get("response", "")
+                if data.get("done"):
+                    break
     
     @staticmethod
     def _parse_csv_response(content: str) -> List[Dict[str, str]]:
         """Parse CSV format response from LLM"""
-        words_and_clues = []
-        lines = content.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if ',' in line and not line.startswith('#'):
-                parts = line.split(',', 1)
-                if len(parts) == 2:
-                    word = parts[0].strip().upper()
-                    clue = parts[1].strip()
-                    
-                    # Validate word
-                    if 3 <= len(word) <= 15 and word.isalpha():
-                        words_and_clues.append({
-                            "word": word,
-                            "clue": clue
-                        })
-        
-        # Ensure we have enough words, pad with mock if needed
+        with span("llm_parse"):
+            words_and_clues = []
+            lines = content.strip().split('\n')
+            
+            for line in lines:
+                entry = LLMService._parse_csv_line(line)
+                if entry is not None:
+                    words_and_clues.append(entry)
+            
+            return words_and_clues
+    
+    @staticmethod
+    def _parse_csv_line(line: str) -> Optional[Dict[str, str]]:
+        """Parse one WORD,CLUE line, or return None if it is not a valid entry"""
+        line = line.strip()
+        if ',' in line and not line.startswith('#'):
+            parts = line.split(',', 1)
+            if len(parts) == 2:
+                word = parts[0].strip().upper()
+                clue = parts[1].strip()
+                
+                # Validate word
+                if 3 <= len(word) <= 15 and word.isalpha():
+                    return {
+                        "word": word,
+                        "clue": clue
+                    }
+        return None
+    
+    @staticmethod
+    def _pad_words(words_and_clues: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Ensure we have enough words, pad with mock if needed"""
         if len(words_and_clues) < 20:
+            LLM_FALLBACKS.inc(LLMService.config()["provider"], "padded")
             mock_words = LLMService._get_mock_words("general")
             words_and_clues.extend(mock_words[:30 - len(words_and_clues)])
         
@@ -236,4 +653,58 @@ Now generate 30 words for the topic: "{topic}"
         else:
             words = general_words
         
-        return words[:30]
\ No newline at end of file
+        return words[:30]
+
+class CSVLineParser:
+    """Incrementally parse WORD,CLUE lines out of streamed text chunks"""
+    
+    def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """Add a chunk and return the entries from any lines it completed"""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        return [entry for entry in map(LLMService._parse_csv_line, lines) if entry is not None]
+    
+    def close(self) -> List[Dict[str, str]]:
+        """Parse whatever is left once the stream ends"""
+        line, self._buffer = self._buffer, ""
+        entry = LLMService._parse_csv_line(line)
+        return [entry] if entry is not None else []
+
+class StreamedWords:
+    """Entries of one streamed provider response, shared by every request waiting on it
+    
+    The background call adds entries as lines arrive and closes it when the
+    stream ends or fails; iterating replays the entries so far and then
+    follows the stream until it is closed.
+    """
+    
+    def __init__(self):
+        self.entries: List[Dict[str, str]] = []
+        self.closed = False
+        self._arrived = asyncio.Event()
+    
+    def add(self, entry: Dict[str, str]) -> None:
+        self.entries.append(entry)
+        self._wake()
+    
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+    
+    def _wake(self) -> None:
+        # Each waiter holds the event current when it started waiting
+        self._arrived.set()
+        self._arrived = asyncio.Event()
+    
+    async def __aiter__(self) -> AsyncIterator[Dict[str, str]]:
+        position = 0
+        while True:
+            while position < len(self.entries):
+                yield self.entries[position]
+                position += 1
+            if self.closed:
+                return
+            await self._arrived.wait()
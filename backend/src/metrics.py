@@ -0,0 +1,198 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Seconds; covers a cached response up to a slow LLM call
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    """A named metric family rendered in the Prometheus text format
+
+    Metrics are only updated from the asyncio event loop, so plain dicts
+    are enough: no locks are taken on the request path.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, formatted labels, value) for every series"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for label_values, value in self.values.items():
+            yield "", _format_labels(self.labels, label_values), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # label values -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self.series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for label_values, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield "_bucket", _format_labels(self.labels, label_values, f'le="{le}"'), cumulative
+            labels = _format_labels(self.labels, label_values)
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+class CallbackMetric(Metric):
+    """Metric whose series are read from a callback at scrape time
+
+    Used for values other components already track, such as cache
+    counters, so they cost nothing until /metrics is requested.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, labels: Iterable[str],
+                 collect: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, help, labels)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for label_values, value in self.collect().items():
+            yield "", _format_labels(self.labels, label_values), value
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def callback(self, name: str, help: str, kind: str, labels: Iterable[str],
+                 collect: Callable[[], Dict[LabelValues, float]]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, kind, labels, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled")
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "LLM provider call latency", ("provider", "outcome"))
+LLM_FALLBACKS = registry.counter(
+    "llm_fallbacks_total", "Topic requests answered from mock words or padded with them", ("provider", "reason"))
+GENERATION_SECONDS = registry.histogram(
+    "crossword_generation_duration_seconds", "Time a worker spent generating a crossword", ("strategy",))
+WORDS_REQUESTED = registry.counter(
+    "crossword_words_requested_total", "Usable words submitted for generation")
+WORDS_PLACED = registry.counter(
+    "crossword_words_placed_total", "Words placed in generated crosswords")
+PLACEMENT_RATIO = registry.histogram(
+    "crossword_placement_ratio", "Fraction of submitted words placed per crossword", buckets=RATIO_BUCKETS)
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router records the matched route on the scope; using its
+            # template keeps ids in paths like /clues/{id} out of the labels
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status)
+            )
+
+def record_generation(strategy: str, seconds: float, requested: int, placed: int) -> None:
+    GENERATION_SECONDS.observe(seconds, strategy)
+    WORDS_REQUESTED.inc(amount=requested)
+    WORDS_PLACED.inc(amount=placed)
+    if requested:
+        PLACEMENT_RATIO.observe(placed / requested)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from typing import Any, List, Literal, Optional, Tuple, Dict
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+from generation_stats import GenerationStats
+from grid_state import MAX_LETTERS
 
 class Direction(Enum):
     HORIZONTAL = "horizontal"
@@ -22,14 +24,55 @@ class CrosswordGrid:
     width: int
     height: int
     word_placements: List[WordPlacement]
+    seed: Optional[int] = None
+    # GenerationStats when the generator was asked to collect them
+    stats: Optional[GenerationStats] = None
+    # False when the search was cut off by its deadline
+    completed: bool = True
 
 class TopicRequest(BaseModel):
     topic: str
 
-class WordListRequest(BaseModel):
+class GenerationOptions(BaseModel):
+    # Working grid side; null sizes it from the words. The returned grid is
+    # trimmed to the placed words either way
+    grid_size: Optional[int] = Field(default=None, ge=5, le=41)
+    # Same words, grid_size, seed and strategy always give the same puzzle
+    seed: Optional[int] = Field(default=None, ge=0, lt=2 ** 32)
+    strategy: Literal["greedy", "backtrack"] = "greedy"
+    # Independent generations to run server-side, keeping the best layout
+    starts: int = Field(default=1, ge=1, le=64)
+    # Hard ceiling on generation time; the best layout found so far is
+    # returned, with completed=False if the search was cut off
+    deadline_ms: Optional[int] = Field(default=None, ge=1)
+    # Stop once this many words are placed; null places as many as fit
+    max_words: Optional[int] = Field(default=12, ge=1, le=500)
+    # Return GenerationStats explaining why words were left out
+    include_stats: bool = False
+
+class WordListRequest(GenerationOptions):
     words: List[str]
     crossword_id: Optional[str] = None
 
+    @field_validator("words")
+    @classmethod
+    def words_fit_grid_alphabet(cls, words: List[str]) -> List[str]:
+        # Counted over the words CrosswordGenerator keeps (normalize_words)
+        letters = {char for word in words if len(word.strip()) >= 3 and word.strip().isalpha()
+                   for char in word.upper().strip()}
+        if len(letters) > MAX_LETTERS:
+            raise ValueError(f"words use {len(letters)} distinct letters, at most {MAX_LETTERS} are supported")
+        return words
+
+class BatchRequest(BaseModel):
+    # Each item carries its own words, seed and grid_size. Items are checked
+    # against WordListRequest one by one, so an invalid item is reported on
+    # its own line instead of rejecting the whole batch
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=1000)
+
+class PuzzleRequest(GenerationOptions):
+    topic: str
+
 class TopicWordsResponse(BaseModel):
     words: List[str]
     crossword_id: str
@@ -39,6 +82,10 @@ class CrosswordResponse(BaseModel):
     word_placements: List[Dict]
     width: int
     height: int
+    seed: Optional[int] = None
+    strategy: str = "greedy"
+    stats: Optional[Dict] = None
+    completed: bool = True
 
 class CluesResponse(BaseModel):
     clues: Dict[str, str]
\ No newline at end of file
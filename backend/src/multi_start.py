@@ -0,0 +1,164 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from crossword_generator import MAX_WORDS, CrosswordGenerator
+from generation_stats import GenerationStats
+from models import CrosswordGrid
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Generation executor threads may ask for the pool at the same time
+_process_pool_lock = threading.Lock()
+# Set in generation executor worker processes, which must not start a pool
+# of their own: one per worker would mean cores x cores processes
+_sequential_starts = False
+
+def run_starts_sequentially() -> None:
+    """Process pool initializer: run multi-start generations in the worker itself"""
+    global _sequential_starts
+    _sequential_starts = True
+
+def available_cores() -> int:
+    """Cores this process may run on (respects container CPU affinity)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared process pool for multi-start generation, created on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=available_cores())
+        return _process_pool
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+def score_layout(crossword: CrosswordGrid) -> Tuple[int, int, float]:
+    """Rank layouts by placed words, then intersections, then bounding-box density"""
+    filled = [
+        (row, col)
+        for row, cells in enumerate(crossword.grid)
+        for col, cell in enumerate(cells)
+        if cell is not None
+    ]
+    if not filled:
+        return (0, 0, 0.0)
+
+    # Every letter shared by two words is counted twice in the word lengths
+    intersections = sum(len(wp.word) for wp in crossword.word_placements) - len(filled)
+
+    rows = [row for row, _ in filled]
+    cols = [col for _, col in filled]
+    area = (max(rows) - min(rows) + 1) * (max(cols) - min(cols) + 1)
+
+    return (len(crossword.word_placements), intersections, len(filled) / area)
+
+def _generate_seeded(words: List[str], grid_size: Optional[int], strategy: str, seed: int,
+                     deadline_ms: Optional[int] = None, max_words: Optional[int] = MAX_WORDS,
+                     include_stats: bool = False) -> CrosswordGrid:
+    """Worker entry point: one independent generation from a fixed seed"""
+    stats = GenerationStats() if include_stats else None
+    generator = CrosswordGenerator(words, grid_size=grid_size, strategy=strategy, seed=seed,
+                                   deadline_ms=deadline_ms, max_words=max_words, stats=stats)
+    return generator.generate_crossword()
+
+def generate_best_crossword(words: List[str], grid_size: Optional[int] = None, strategy: str = "greedy",
+                            starts: Optional[int] = None, deadline_ms: Optional[int] = None,
+                            seed: Optional[int] = None, max_words: Optional[int] = MAX_WORDS,
+                            include_stats: bool = False) -> CrosswordGrid:
+    """Run independent seeded generations across the process pool and keep the best layout
+
+    Per-run seeds are derived from seed, and the returned layout carries the
+    seed of the run that produced it, so it can be regenerated on its own.
+    Each run also stops its own search at deadline_ms. Once it has passed,
+    generations that have not started are cancelled and the best finished
+    layout is returned, marked incomplete if any run was cut off; if none has
+    finished yet, the first one to complete is used.
+
+    Inside a generation executor worker process the runs are made one after
+    another in that process instead, sharing the deadline.
+    """
+    starts = starts or available_cores()
+    deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms is not None else None
+    rng = random.Random(seed)
+    seeds = [rng.randrange(2 ** 32) for _ in range(starts)]
+
+    if _sequential_starts:
+        return _generate_best_sequentially(words, grid_size, strategy, seeds, deadline, max_words, include_stats)
+
+    # Ties go to the earliest run so a seeded request is stable regardless
+    # of which worker finishes first
+    pool = get_process_pool()
+    run_index: Dict[Future, int] = {
+        pool.submit(_generate_seeded, words, grid_size, strategy, run_seed,
+                    deadline_ms, max_words, include_stats): i
+        for i, run_seed in enumerate(seeds)
+    }
+    pending: Set[Future] = set(run_index)
+    best: Optional[CrosswordGrid] = None
+    best_score = None
+    error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            timeout = None
+            if deadline is not None and best is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    crossword = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+
+                score = (score_layout(crossword), -run_index[future])
+                if best is None or score > best_score:
+                    best, best_score = crossword, score
+
+            if deadline is not None and best is not None and time.monotonic() >= deadline:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+
+    if best is None:
+        raise error or RuntimeError("No crossword generated")
+    if pending:
+        best.completed = False
+    return best
+
+def _generate_best_sequentially(words: List[str], grid_size: Optional[int], strategy: str, seeds: List[int],
+                                deadline: Optional[float], max_words: Optional[int],
+                                include_stats: bool) -> CrosswordGrid:
+    """One run per seed in this process, each given the time left before deadline"""
+    best: Optional[CrosswordGrid] = None
+    best_score = None
+
+    for i, run_seed in enumerate(seeds):
+        remaining_ms = None
+        if deadline is not None:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if best is not None and remaining_ms <= 0:
+                best.completed = False
+                break
+
+        crossword = _generate_seeded(words, grid_size, strategy, run_seed,
+                                     max(1, remaining_ms) if remaining_ms is not None else None,
+                                     max_words, include_stats)
+        score = (score_layout(crossword), -i)
+        if best is None or score > best_score:
+            best, best_score = crossword, score
+
+    return best
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from crossword_generator import MAX_WORDS, normalize_words
+
+def crossword_cache_key(words: List[str], grid_size: int, seed: Optional[int], strategy: str,
+                        starts: int = 1, deadline_ms: Optional[int] = None,
+                        include_stats: bool = False, max_words: Optional[int] = MAX_WORDS,
+                        wire_format: str = "json") -> str:
+    """Canonical hash of everything that determines a generated crossword
+
+    Words are normalized exactly as CrosswordGenerator does and sorted, so
+    requests that differ only in order, case or filtered-out entries share a
+    key. An unseeded request caches whichever layout was generated first.
+    """
+    canonical = json.dumps(
+        [sorted(normalize_words(words)), grid_size, seed, strategy, starts, deadline_ms, include_stats, max_words, wire_format],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class ResultCache:
+    """Bounded LRU cache of serialized response bodies with a TTL and byte budget"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # key -> (expires_at, body), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, body = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        # Bodies that could never fit would only flush everything else
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self.size_bytes += len(body)
+
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, body = self._entries.pop(key)
+        self.size_bytes -= len(body)
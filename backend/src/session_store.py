@@ -0,0 +1,228 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlite_support import ExpirySweep, write_transaction
+
+# Clues packed as (word, clue) pairs; words are interned so the same word
+# across many sessions is stored once
+PackedClues = Tuple[Tuple[str, str], ...]
+
+class SessionStore(ABC):
+    """crossword_id -> clues storage used by /generate-from-topic and /clues"""
+
+    @abstractmethod
+    def put(self, crossword_id: str, word_clues: List[Dict[str, str]]) -> None:
+        """Store the clues generated for a crossword"""
+
+    @abstractmethod
+    def get(self, crossword_id: str) -> Optional[Dict[str, str]]:
+        """Clues keyed by word, or None if the id is unknown or expired"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Size gauges for monitoring"""
+
+    async def put_async(self, crossword_id: str, word_clues: List[Dict[str, str]]) -> None:
+        """put() for callers on the event loop; stores that can block override it"""
+        self.put(crossword_id, word_clues)
+
+    async def get_async(self, crossword_id: str) -> Optional[Dict[str, str]]:
+        """get() for callers on the event loop; stores that can block override it"""
+        return self.get(crossword_id)
+
+    def close(self) -> None:
+        """Release any resources held by the store"""
+
+class InMemorySessionStore(SessionStore):
+    """Bounded crossword_id -> clues store with a per-entry TTL and LRU eviction
+
+    Entries live in one process, so with several uvicorn workers use
+    SQLiteSessionStore instead.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # crossword_id -> (expires_at, packed clues, approximate bytes), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, PackedClues, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _pack(word_clues: List[Dict[str, str]]) -> PackedClues:
+        return tuple((sys.intern(item['word']), item['clue']) for item in word_clues)
+
+    @staticmethod
+    def _approximate_size(crossword_id: str, packed: PackedClues) -> int:
+        """Bytes held by an entry, not counting interned words shared with other entries"""
+        size = sys.getsizeof(crossword_id) + sys.getsizeof(packed)
+        for pair in packed:
+            size += sys.getsizeof(pair) + sys.getsizeof(pair[1])
+        return size
+
+    def put(self, crossword_id: str, word_clues: List[Dict[str, str]]) -> None:
+        """Store the clues for a crossword, evicting the least recently used entries if full"""
+        packed = self._pack(word_clues)
+        size = self._approximate_size(crossword_id, packed)
+
+        with self._lock:
+            if crossword_id in self._entries:
+                self._remove(crossword_id)
+
+            self._entries[crossword_id] = (time.monotonic() + self.ttl_seconds, packed, size)
+            self.size_bytes += size
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get(self, crossword_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            entry = self._entries.get(crossword_id)
+            if entry is None:
+                return None
+
+            expires_at, packed, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(crossword_id)
+                return None
+
+            self._entries.move_to_end(crossword_id)
+
+        return dict(packed)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, crossword_id: str) -> None:
+        _, _, size = self._entries.pop(crossword_id)
+        self.size_bytes -= size
+
+class SQLiteSessionStore(SessionStore):
+    """Session store shared by every worker on a node through a local SQLite file
+
+    The database runs in WAL mode so readers in one worker never block the
+    writer in another. Statements are fixed strings and therefore reused from
+    sqlite3's prepared statement cache. Each put writes all of a session's
+    clues in one transaction, and at most once every sweep_interval seconds
+    that transaction also deletes expired sessions and recounts the rest.
+
+    A write can wait up to busy_timeout for another worker's transaction, so
+    the async methods run on a thread rather than on the event loop.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS sessions (
+            crossword_id TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS clues (
+            crossword_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            word TEXT NOT NULL,
+            clue TEXT NOT NULL,
+            PRIMARY KEY (crossword_id, position)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)",
+    )
+    UPSERT_SESSION = "INSERT OR REPLACE INTO sessions (crossword_id, expires_at) VALUES (?, ?)"
+    DELETE_CLUES = "DELETE FROM clues WHERE crossword_id = ?"
+    INSERT_CLUE = "INSERT INTO clues (crossword_id, position, word, clue) VALUES (?, ?, ?, ?)"
+    SELECT_SESSION = "SELECT expires_at FROM sessions WHERE crossword_id = ?"
+    SELECT_CLUES = "SELECT word, clue FROM clues WHERE crossword_id = ? ORDER BY position"
+    SWEEP_CLUES = "DELETE FROM clues WHERE crossword_id IN (SELECT crossword_id FROM sessions WHERE expires_at <= ?)"
+    SWEEP_SESSIONS = "DELETE FROM sessions WHERE expires_at <= ?"
+    COUNT_SESSIONS = "SELECT COUNT(*) FROM sessions"
+
+    def __init__(self, path: str, ttl_seconds: float = 3600, sweep_interval: float = 60):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        # Sessions counted at the last sweep, so stats() never scans the table
+        self._entries = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._lock:
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._entries = self._conn.execute(self.COUNT_SESSIONS).fetchone()[0]
+        self._sweeper = ExpirySweep(self._conn, self._lock, sweep_interval, self._delete_expired)
+
+    def put(self, crossword_id: str, word_clues: List[Dict[str, str]]) -> None:
+        now = time.time()
+        rows = [
+            (crossword_id, position, item['word'], item['clue'])
+            for position, item in enumerate(word_clues)
+        ]
+
+        with self._lock, write_transaction(self._conn):
+            self._conn.execute(self.UPSERT_SESSION, (crossword_id, now + self.ttl_seconds))
+            self._conn.execute(self.DELETE_CLUES, (crossword_id,))
+            self._conn.executemany(self.INSERT_CLUE, rows)
+
+            if self._sweeper.due(now):
+                self._sweeper.run(now)
+
+    async def put_async(self, crossword_id: str, word_clues: List[Dict[str, str]]) -> None:
+        await asyncio.to_thread(self.put, crossword_id, word_clues)
+
+    async def get_async(self, crossword_id: str) -> Optional[Dict[str, str]]:
+        return await asyncio.to_thread(self.get, crossword_id)
+
+    def get(self, crossword_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            session = self._conn.execute(self.SELECT_SESSION, (crossword_id,)).fetchone()
+            if session is None or session[0] <= time.time():
+                return None
+            return dict(self._conn.execute(self.SELECT_CLUES, (crossword_id,)).fetchall())
+
+    def sweep(self) -> None:
+        """Delete every expired session now"""
+        self._sweeper.sweep_now()
+
+    def _delete_expired(self, now: float) -> None:
+        self._conn.execute(self.SWEEP_CLUES, (now,))
+        self._conn.execute(self.SWEEP_SESSIONS, (now,))
+        self._entries = self._conn.execute(self.COUNT_SESSIONS).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """entries is as of the last sweep, at most sweep_interval old while sessions are written"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"entries": self._entries, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def create_session_store() -> SessionStore:
+    """Build the session store selected by SESSION_STORE (memory or sqlite)"""
+    backend = os.getenv("SESSION_STORE", "memory")
+    ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+    if backend == "sqlite":
+        return SQLiteSessionStore(
+            os.getenv("SESSION_DB_PATH", "/tmp/crossword-sessions.sqlite3"),
+            ttl_seconds=ttl_seconds
+        )
+    if backend == "memory":
+        return InMemorySessionStore(
+            max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "10000")),
+            ttl_seconds=ttl_seconds
+        )
+    raise ValueError(f"Unknown SESSION_STORE '{backend}', expected memory or sqlite")
@@ -0,0 +1,49 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT, rolling back if the body raises
+
+    The stores keep one autocommit connection each, so a transaction left
+    open by a failed statement would break every later write on it.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+class ExpirySweep:
+    """Periodic deletion of a SQLite store's expired rows
+
+    Writes check due() and call run() inside their own transaction; sweep_now()
+    runs one immediately in a transaction of its own. The schedule is kept in
+    wall-clock time, since rows are shared between processes.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock,
+                 interval: float, delete_expired: Callable[[float], None]):
+        self.interval = interval
+        self.next_at = time.time() + interval
+        self._conn = conn
+        # The store's lock for its connection, held by callers of run()
+        self._lock = lock
+        self._delete_expired = delete_expired
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_at
+
+    def run(self, now: float) -> None:
+        """Sweep within the caller's transaction"""
+        self._delete_expired(now)
+        self.next_at = now + self.interval
+
+    def sweep_now(self) -> None:
+        with self._lock, write_transaction(self._conn):
+            self.run(time.time())
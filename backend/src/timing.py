@@ -0,0 +1,86 @@
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+class RequestTimings:
+    """Milliseconds spent in each named phase of one request"""
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        # Phase -> total milliseconds; a phase entered twice accumulates
+        self.spans: Dict[str, float] = {}
+
+    def add(self, name: str, ms: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def header(self) -> str:
+        """Server-Timing header value, e.g. llm;dur=812.4, generate;dur=3.1"""
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.spans.items())
+
+# Timings of the request being handled; copied into tasks it starts, so
+# spans recorded there land on the request that started them
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a phase of the current request, if any"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - start) * 1000)
+
+class ServerTimingMiddleware:
+    """ASGI middleware collecting spans per request into a Server-Timing header
+
+    The header is added when the response starts, so it covers every span
+    finished by then plus a total. With log=True one JSON line per request
+    is printed once the response completes.
+    """
+
+    def __init__(self, app, log: bool = False):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings.add("total", (time.perf_counter() - start) * 1000)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.log:
+                print(json.dumps({
+                    "event": "request_timing",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "spans_ms": {name: round(ms, 3) for name, ms in timings.spans.items()},
+                }))
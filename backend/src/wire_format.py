@@ -0,0 +1,97 @@
+import json
+from typing import Dict, List, Literal, Optional
+
+from models import CrosswordGrid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# json: the CrosswordResponse shape (default)
+# rows: each grid row as a fixed-width string with BLOCK for empty cells,
+#   plus compact placements
+# placements: compact placements only; the client derives the grid from them
+# Compact placements are [word, start_row, start_col, "h" | "v", number, clue]
+WireFormat = Literal["json", "rows", "placements"]
+
+BLOCK = "#"
+
+MEDIA_TYPES: Dict[str, str] = {
+    "json": "application/json",
+    "rows": "application/vnd.crossword.rows+json",
+    "placements": "application/vnd.crossword.placements+json",
+}
+_FORMATS_BY_MEDIA_TYPE = {media_type: fmt for fmt, media_type in MEDIA_TYPES.items() if fmt != "json"}
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """Format named by the query parameter, else the first compact media type in Accept"""
+    if requested is not None:
+        return requested
+
+    for media_range in (accept or "").split(","):
+        fmt = _FORMATS_BY_MEDIA_TYPE.get(media_range.split(";", 1)[0].strip().lower())
+        if fmt is not None:
+            return fmt
+    return "json"
+
+def compact_placements(crossword_grid: CrosswordGrid) -> List[list]:
+    return [
+        [wp.word, wp.start_row, wp.start_col, wp.direction.value[0], wp.number, wp.clue]
+        for wp in crossword_grid.word_placements
+    ]
+
+def grid_rows(crossword_grid: CrosswordGrid) -> List[str]:
+    return ["".join([cell or BLOCK for cell in row]) for row in crossword_grid.grid]
+
+def encode_crossword(crossword_grid: CrosswordGrid, strategy: str, fmt: str = "json") -> bytes:
+    """Serialize a generated crossword in one of the wire formats
+    
+    The payload is built as plain dicts and encoded directly, with orjson
+    when it is installed: a freshly generated grid needs no model validation.
+    """
+    stats = crossword_grid.stats.to_dict() if crossword_grid.stats is not None else None
+
+    if fmt == "json":
+        payload = {
+            "grid": crossword_grid.grid,
+            "word_placements": [
+                {
+                    "word": wp.word,
+                    "start_row": wp.start_row,
+                    "start_col": wp.start_col,
+                    "direction": wp.direction.value,
+                    "clue": wp.clue,
+                    "number": wp.number
+                }
+                for wp in crossword_grid.word_placements
+            ],
+            "width": crossword_grid.width,
+            "height": crossword_grid.height,
+            "seed": crossword_grid.seed,
+            "strategy": strategy,
+            "stats": stats,
+            "completed": crossword_grid.completed,
+        }
+        return dumps(payload)
+
+    payload = {
+        "format": fmt,
+        "width": crossword_grid.width,
+        "height": crossword_grid.height,
+    }
+    if fmt == "rows":
+        payload["block"] = BLOCK
+        payload["rows"] = grid_rows(crossword_grid)
+    payload["placements"] = compact_placements(crossword_grid)
+    payload["seed"] = crossword_grid.seed
+    payload["strategy"] = strategy
+    payload["completed"] = crossword_grid.completed
+    if stats is not None:
+        payload["stats"] = stats
+    return dumps(payload)
@@ -0,0 +1,17 @@
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models import CrosswordGrid, Direction
+
+def assert_valid_layout(crossword: CrosswordGrid) -> None:
+    """Every placed word matches the grid, so crossings agree"""
+    for placement in crossword.word_placements:
+        for i, letter in enumerate(placement.word):
+            if placement.direction == Direction.HORIZONTAL:
+                row, col = placement.start_row, placement.start_col + i
+            else:
+                row, col = placement.start_row + i, placement.start_col
+            assert crossword.grid[row][col] == letter
@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+import json
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 import sys
@@ -8,11 +9,12 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from api import app
+from api import app, result_cache, generation_executor
 
 class TestAPI:
     @pytest.fixture
     def client(self):
+        result_cache.clear()
         return TestClient(app)
     
     def test_health_check(self, client):
@@ -22,6 +24,7 @@ class TestAPI:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["service"] == "crossword-generator"
+        assert "coalesced_calls" in data["llm"]
     
     @patch('api.LLMService.generate_words_and_clues_from_topic')
     def test_generate_from_topic_success(self, mock_llm, client):
@@ -62,8 +65,9 @@ class TestAPI:
         assert "word_placements" in data
         assert "width" in data
         assert "height" in data
-        assert data["width"] == 15
-        assert data["height"] == 15
+        assert data["height"] == len(data["grid"])
+        assert data["width"] == len(data["grid"][0])
+        assert data["width"] < 15
     
     def test_generate_crossword_empty_words(self, client):
         """Test crossword generation with empty word list"""
@@ -107,4 +111,254 @@ class TestAPI:
         """Test CORS headers are properly set"""
         response = client.options("/health")
         # FastAPI TestClient may not fully simulate CORS, but we can check the middleware is configured
-        assert response.status_code in [200, 405]  # OPTIONS may not be implemented for all endpoints
\ No newline at end of file
+        assert response.status_code in [200, 405]  # OPTIONS may not be implemented for all endpoints
+    
+    def test_generate_crossword_multi_start(self, client):
+        """Server-side multi-start returns a single best layout"""
+        words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+        response = client.post("/generate-crossword", json={"words": words, "starts": 2, "deadline_ms": 5000})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["word_placements"]) > 1
+    
+    def test_generate_crossword_seed_round_trip(self, client):
+        """Response carries the seed, and resending it reproduces the grid"""
+        words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+        first = client.post("/generate-crossword", json={"words": words}).json()
+        
+        assert first["seed"] is not None
+        assert first["strategy"] == "greedy"
+        
+        replay = client.post("/generate-crossword", json={"words": words, "seed": first["seed"]}).json()
+        assert replay["grid"] == first["grid"]
+        assert replay["word_placements"] == first["word_placements"]
+    
+    def test_generate_crossword_too_many_letters(self, client):
+        """Lists with more distinct letters than a grid cell can encode are rejected up front"""
+        words = ["".join(chr(0x4E00 + i * 3 + j) for j in range(3)) for i in range(100)]
+        assert all(word.isalpha() for word in words)
+        
+        response = client.post("/generate-crossword", json={"words": words})
+        assert response.status_code == 422
+        assert "distinct letters" in response.text
+        
+        assert client.post("/generate-crossword", json={"words": words[:80], "seed": 1}).status_code == 200
+    
+    def test_generate_crossword_invalid_strategy(self, client):
+        response = client.post("/generate-crossword", json={"words": ["PYTHON"], "strategy": "random"})
+        assert response.status_code == 422
+    
+    def test_generate_crossword_cached(self, client):
+        """Equivalent word lists are served from the result cache"""
+        words = ["PYTHON", "CODE", "TEST", "GRID"]
+        first = client.post("/generate-crossword", json={"words": words})
+        hits = result_cache.hits
+        
+        second = client.post("/generate-crossword", json={"words": ["grid", "test", "code", "python", "a"]})
+        
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert result_cache.hits == hits + 1
+    
+    def test_generate_crossword_queue_full(self, client):
+        """A saturated generation pool answers 503 with Retry-After"""
+        with patch.object(generation_executor, "max_queue", 0):
+            response = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"]})
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    
+    @patch('api.LLMService.generate_words_and_clues_from_topic')
+    def test_generate_puzzle_attaches_clues(self, mock_llm, client):
+        """One call returns the crossword with every placement's clue filled in"""
+        async def mock_response(topic, min_words=0):
+            return [
+                {"word": "PYTHON", "clue": "Snake language"},
+                {"word": "CODE", "clue": "Program text"},
+                {"word": "TEST", "clue": "Check it works"}
+            ]
+        
+        mock_llm.side_effect = mock_response
+        
+        response = client.post("/generate-puzzle", json={"topic": "programming", "seed": 7})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["seed"] == 7
+        assert data["word_placements"]
+        clues = {"PYTHON": "Snake language", "CODE": "Program text", "TEST": "Check it works"}
+        for placement in data["word_placements"]:
+            assert placement["clue"] == clues[placement["word"]]
+    
+    def test_generate_puzzle_invalid_request(self, client):
+        """Test /generate-puzzle without a topic"""
+        response = client.post("/generate-puzzle", json={})
+        assert response.status_code == 422
+    
+    def test_generate_batch_streams_ndjson(self, client):
+        """Every item gets one NDJSON line and a bad item does not fail the batch"""
+        response = client.post("/generate-batch", json={"items": [
+            {"words": ["PYTHON", "CODE", "TEST"], "seed": 1},
+            {"words": []},
+            {"words": ["JAVA", "RUBY", "PERL"], "seed": 2, "grid_size": 11}
+        ]})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        results = {line["index"]: line for line in lines}
+        assert sorted(results) == [0, 1, 2]
+        
+        assert results[1]["status"] == "error"
+        assert results[0]["status"] == "ok"
+        assert results[0]["crossword"]["seed"] == 1
+        assert results[2]["crossword"]["width"] <= 11
+        
+        # Matches what the single-item endpoint returns for the same request
+        single = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE", "TEST"], "seed": 1})
+        assert single.json() == results[0]["crossword"]
+    
+    def test_generate_batch_reports_item_failures(self, client):
+        """A generation error is reported on that item's line only"""
+        def flaky(request):
+            if request.seed == 2:
+                raise RuntimeError("boom")
+            return real_build(request)
+        
+        from generation_executor import build_crossword as real_build
+        with patch('generation_executor.build_crossword', side_effect=flaky):
+            response = client.post("/generate-batch", json={"items": [
+                {"words": ["PYTHON", "CODE"], "seed": 1},
+                {"words": ["PYTHON", "CODE"], "seed": 2}
+            ]})
+        
+        results = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+        assert results[0]["status"] == "ok"
+        assert results[1] == {"index": 1, "status": "error", "detail": "Failed to generate crossword: boom"}
+    
+    def test_generate_batch_reports_invalid_items(self, client):
+        """An item that fails validation gets its own error line; the rest still generate"""
+        response = client.post("/generate-batch", json={"items": [
+            {"words": ["PYTHON", "CODE", "TEST"], "seed": 1},
+            {"words": ["PYTHON", "CODE", "TEST"], "grid_size": 3},
+            {"grid_size": 11}
+        ]})
+        
+        assert response.status_code == 200
+        results = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+        assert sorted(results) == [0, 1, 2]
+        assert results[0]["status"] == "ok"
+        assert results[1]["status"] == "error"
+        assert results[1]["detail"].startswith("Invalid item: grid_size:")
+        assert results[2]["status"] == "error"
+        assert results[2]["detail"].startswith("Invalid item: words:")
+    
+    def test_generate_batch_empty(self, client):
+        """A batch needs at least one item"""
+        response = client.post("/generate-batch", json={"items": []})
+        assert response.status_code == 422
+    
+    def test_generate_crossword_include_stats(self, client):
+        """Stats are only returned when asked for"""
+        plain = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"], "seed": 1})
+        assert plain.json()["stats"] is None
+        
+        response = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"], "seed": 1, "include_stats": True})
+        stats = response.json()["stats"]
+        assert stats["can_place_calls"] > 0
+        assert set(stats["rejections"]) == {"bounds", "conflict", "perpendicular", "boundary"}
+    
+    def test_generate_crossword_max_words(self, client):
+        """max_words sets the word target and is validated"""
+        words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+        response = client.post("/generate-crossword", json={"words": words, "seed": 2, "max_words": 2})
+        assert len(response.json()["word_placements"]) == 2
+        
+        unlimited = client.post("/generate-crossword", json={"words": words, "seed": 2, "max_words": None})
+        assert unlimited.status_code == 200
+        assert len(unlimited.json()["word_placements"]) > 2
+        
+        assert client.post("/generate-crossword", json={"words": words, "max_words": 0}).status_code == 422
+    
+    def test_generate_crossword_compact_formats(self, client):
+        """Compact formats are chosen by query parameter or Accept and cached separately"""
+        request = {"words": ["PYTHON", "CODE", "TEST"], "seed": 6}
+        full = client.post("/generate-crossword", json=request).json()
+        
+        rows = client.post("/generate-crossword?format=rows", json=request)
+        assert rows.headers["content-type"].startswith("application/vnd.crossword.rows+json")
+        assert rows.headers["vary"] == "Accept"
+        assert rows.json()["rows"] == ["".join(cell or "#" for cell in row) for row in full["grid"]]
+        
+        placements = client.post("/generate-crossword", json=request,
+                                 headers={"Accept": "application/vnd.crossword.placements+json"})
+        data = placements.json()
+        assert data["format"] == "placements"
+        assert [p[0] for p in data["placements"]] == [wp["word"] for wp in full["word_placements"]]
+        assert len(placements.content) < len(rows.content) < len(client.post("/generate-crossword", json=request).content)
+        
+        assert client.post("/generate-crossword?format=xml", json=request).status_code == 422
+    
+    def test_metrics_endpoint(self, client):
+        """Route latency uses the route template and generation metrics are recorded"""
+        client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"], "seed": 5})
+        client.get("/clues/some-unknown-id")
+        
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        
+        text = response.text
+        assert 'http_request_duration_seconds_count{method="POST",route="/generate-crossword",status="200"}' in text
+        assert 'route="/clues/{crossword_id}",status="404"' in text
+        assert "some-unknown-id" not in text
+        assert 'crossword_generation_duration_seconds_count{strategy="greedy"}' in text
+        assert "crossword_words_placed_total" in text
+        assert 'cache_requests_total{cache="result",outcome="miss"}' in text
+        assert "generation_in_flight 0" in text
+    
+    def test_server_timing_header(self, client):
+        """Responses break the request down into phases"""
+        response = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"], "seed": 9})
+        
+        timing = response.headers["server-timing"]
+        for phase in ("cache", "generate", "serialize", "total"):
+            assert f"{phase};dur=" in timing
+        
+        # A cached response skips generation
+        cached = client.post("/generate-crossword", json={"words": ["PYTHON", "CODE"], "seed": 9})
+        assert "generate;" not in cached.headers["server-timing"]
+    
+    def test_default_deadline_applied(self):
+        """Requests without deadline_ms get the server's default; explicit ones are kept"""
+        from api import with_default_deadline
+        from models import WordListRequest
+        
+        with patch('api.GENERATION_DEADLINE_MS', 2000):
+            assert with_default_deadline(WordListRequest(words=["CODE"])).deadline_ms == 2000
+            assert with_default_deadline(WordListRequest(words=["CODE"], deadline_ms=50)).deadline_ms == 50
+        with patch('api.GENERATION_DEADLINE_MS', None):
+            assert with_default_deadline(WordListRequest(words=["CODE"])).deadline_ms is None
+    
+    def test_generate_crossword_deadline_cut_off(self, client):
+        """A cut-off search reports completed=false and is not cached"""
+        from crossword_generator import CrosswordGenerator
+        
+        def out_of_time(generator):
+            generator.timed_out = True
+            return True
+        
+        request = {"words": ["PYTHON", "CODE", "TEST"], "seed": 4, "deadline_ms": 50}
+        with patch.object(CrosswordGenerator, "_out_of_time", out_of_time):
+            response = client.post("/generate-crossword", json=request)
+        
+        data = response.json()
+        assert response.status_code == 200
+        assert data["completed"] is False
+        assert len(data["word_placements"]) == 1
+        assert result_cache.stats()["entries"] == 0
+        
+        finished = client.post("/generate-crossword", json=request).json()
+        assert finished["completed"] is True
@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Add benchmarks directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_generator import synthetic_words, run_case, compare, main
+
+class TestBenchmarks:
+    def test_synthetic_words_are_seeded(self):
+        """The same seed always gives the same distinct corpus"""
+        words = synthetic_words(50)
+        assert words == synthetic_words(50)
+        assert len(set(words)) == 50
+        assert all(3 <= len(word) <= 12 and word.isalpha() for word in words)
+    
+    def test_run_case_reports_metrics(self):
+        result = run_case(synthetic_words(20), 15, repeats=1)
+        
+        assert result["words"] == 20
+        assert result["words_placed"] > 0
+        assert result["can_place_word_calls"] > 0
+        assert result["peak_kib"] > 0
+    
+    def test_run_case_word_target(self):
+        """Scale cases report ms per placed word for their word target"""
+        result = run_case(synthetic_words(60), 41, repeats=1, max_words=25)
+        
+        assert result["max_words"] == 25
+        assert result["words_placed"] == 25
+        assert result["ms_per_word"] > 0
+    
+    def test_compare_flags_regressions(self):
+        baseline = {"a": {"wall_ms": 10.0, "words_placed": 5}, "b": {"wall_ms": 10.0, "words_placed": 5}}
+        results = {"a": {"wall_ms": 11.0, "words_placed": 5}, "b": {"wall_ms": 20.0, "words_placed": 5}}
+        
+        assert compare(results, baseline, max_regression=0.25) == ["b"]
+    
+    def test_compare_flags_fewer_words_placed(self):
+        """Getting faster by placing fewer words still counts as a regression"""
+        baseline = {"a": {"wall_ms": 10.0, "words_placed": 12}}
+        results = {"a": {"wall_ms": 5.0, "words_placed": 11}}
+        
+        assert compare(results, baseline, max_regression=0.25) == ["a"]
+    
+    def test_compare_skips_other_settings(self):
+        """Cases run with another strategy or word target are not compared"""
+        baseline = {
+            "a": {"wall_ms": 10.0, "words_placed": 12, "strategy": "greedy", "max_words": 12},
+            "b": {"wall_ms": 10.0, "words_placed": 12, "strategy": "greedy", "max_words": 12},
+        }
+        results = {
+            "a": {"wall_ms": 50.0, "words_placed": 12, "strategy": "backtrack", "max_words": 12},
+            "b": {"wall_ms": 50.0, "words_placed": 5, "strategy": "greedy", "max_words": 5},
+        }
+        
+        assert compare(results, baseline, max_regression=0.25) == []
+    
+    def test_main_writes_json(self, tmp_path):
+        output = tmp_path / "results.json"
+        assert main(["--filter", "mock-basketball", "--repeats", "1", "--output", str(output)]) == 0
+        assert "mock-basketball" in output.read_text()
@@ -1,12 +1,17 @@
 import pytest
+import itertools
+import random
 import sys
 import os
+from unittest.mock import patch
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from crossword_generator import CrosswordGenerator
+from crossword_generator import CrosswordGenerator, auto_grid_size
 from models import Direction
+from generation_stats import GenerationStats
+from conftest import assert_valid_layout
 
 class TestCrosswordGenerator:
     @pytest.fixture
@@ -15,7 +20,7 @@ class TestCrosswordGenerator:
     
     @pytest.fixture
     def generator(self, test_words):
-        return CrosswordGenerator(test_words)
+        return CrosswordGenerator(test_words, grid_size=15)
     
     def test_initialization(self, test_words):
         generator = CrosswordGenerator(test_words, grid_size=10)
@@ -37,7 +42,7 @@ class TestCrosswordGenerator:
     
     def test_can_place_word_bounds_checking(self, generator):
         """Test boundary conditions for word placement"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Test horizontal bounds
         assert generator.can_place_word(grid, "PYTHON", 0, 9, Direction.HORIZONTAL) == True
@@ -53,7 +58,7 @@ class TestCrosswordGenerator:
     
     def test_place_word_basic(self, generator):
         """Test basic word placement"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Place horizontal word
         success = generator.place_word(grid, "PYTHON", 5, 3, Direction.HORIZONTAL)
@@ -62,11 +67,11 @@ class TestCrosswordGenerator:
         # Check letters are placed correctly
         expected_word = "PYTHON"
         for i, letter in enumerate(expected_word):
-            assert grid[5][3 + i] == letter
+            assert grid.letter_at(5, 3 + i) == letter
     
     def test_word_conflict_detection(self, generator):
         """Test detection of letter conflicts"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Place first word
         generator.place_word(grid, "PYTHON", 5, 3, Direction.HORIZONTAL)
@@ -77,7 +82,7 @@ class TestCrosswordGenerator:
     
     def test_valid_intersection(self, generator):
         """Test valid word intersections"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Place PYTHON horizontally
         generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
@@ -89,11 +94,11 @@ class TestCrosswordGenerator:
         generator.place_word(grid, "CODE", 6, 9, Direction.VERTICAL)
         
         # Check intersection is correct
-        assert grid[7][9] == 'O'  # Both words share this position
+        assert grid.letter_at(7, 9) == 'O'  # Both words share this position
     
     def test_no_invalid_perpendicular_words(self, generator):
         """Critical: No unintended words like 'MTG', 'AEI', 'RCCROSS'"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Place a word
         generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
@@ -135,7 +140,7 @@ class TestCrosswordGenerator:
     
     def test_no_word_merging(self, generator):
         """Prevent 'SMARTEST' or 'LOGICODE' formations"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = generator.new_grid()
         
         # Place SMART
         generator.place_word(grid, "CROSS", 7, 5, Direction.HORIZONTAL)
@@ -150,9 +155,12 @@ class TestCrosswordGenerator:
         """Generated crossword meets professional standards"""
         crossword = generator.generate_crossword()
         
-        # Basic quality checks
-        assert crossword.width == 15
-        assert crossword.height == 15
+        # Basic quality checks; the grid is trimmed to the placed words
+        assert crossword.height == len(crossword.grid) <= 15
+        assert all(len(row) == crossword.width for row in crossword.grid)
+        assert crossword.width <= 15
+        assert any(crossword.grid[0]) and any(crossword.grid[-1])
+        assert any(row[0] for row in crossword.grid) and any(row[-1] for row in crossword.grid)
         assert len(crossword.word_placements) > 0
         assert len(crossword.word_placements) <= len(generator.words)
         
@@ -166,14 +174,7 @@ class TestCrosswordGenerator:
             assert placement.number > 0
         
         # Check grid consistency
-        for placement in crossword.word_placements:
-            for i, letter in enumerate(placement.word):
-                if placement.direction == Direction.HORIZONTAL:
-                    row, col = placement.start_row, placement.start_col + i
-                else:
-                    row, col = placement.start_row + i, placement.start_col
-                
-                assert crossword.grid[row][col] == letter
+        assert_valid_layout(crossword)
     
     def test_empty_word_list(self):
         """Test handling of empty word list"""
@@ -181,8 +182,54 @@ class TestCrosswordGenerator:
         crossword = generator.generate_crossword()
         
         assert len(crossword.word_placements) == 0
-        assert crossword.width == 15
-        assert crossword.height == 15
+        assert crossword.grid == []
+        assert crossword.width == 0
+        assert crossword.height == 0
+    
+    def test_auto_grid_size(self, test_words):
+        """The working grid scales with the letters to place and fits the longest word"""
+        assert CrosswordGenerator(test_words).grid_size == auto_grid_size(test_words)
+        assert auto_grid_size(test_words) == 15
+        assert auto_grid_size(["ABCDEFGHIJKLMNOPQRST", "CAT"]) == 20
+        assert auto_grid_size([]) == 15
+        # Only the words the search tries first count towards the area
+        many = [f"{a}{b}{c}" for a in "ABCDEFGH" for b in "IJKLMNOP" for c in "QRSTUVWX"]
+        assert auto_grid_size(many, max_words=12) < auto_grid_size(many, max_words=None) == 41
+    
+    def test_auto_grid_places_short_lists(self):
+        """Automatic grids place as many words as the old fixed 15x15 grid"""
+        # Sized from its letters alone this list got a 10x10 grid, which
+        # fits four of its words where 15x15 fits five
+        words = ["PYTHON", "CODE", "CROSS", "GRID", "WORD", "PUZZLE"]
+        for seed in range(10):
+            assert len(CrosswordGenerator(words, seed=seed).generate_crossword().word_placements) >= 5
+        
+        from llm_service import LLMService
+        technology = [item["word"] for item in LLMService._get_mock_words("technology")]
+        assert auto_grid_size(technology) == 17
+        for seed in range(10):
+            auto = CrosswordGenerator(technology, seed=seed).generate_crossword()
+            fixed = CrosswordGenerator(technology, grid_size=15, seed=seed).generate_crossword()
+            assert len(auto.word_placements) >= len(fixed.word_placements)
+    
+    def test_grid_trimmed_to_placed_words(self, generator):
+        """Placements are shifted into the trimmed grid and no border row or column is empty"""
+        crossword = generator.generate_crossword()
+        
+        assert min(wp.start_row for wp in crossword.word_placements) == 0
+        assert min(wp.start_col for wp in crossword.word_placements) == 0
+        assert any(crossword.grid[-1])
+        assert any(row[-1] for row in crossword.grid)
+    
+    def test_word_longer_than_grid_left_out(self):
+        """A first word that cannot fit is reported, not placed"""
+        stats = GenerationStats()
+        crossword = CrosswordGenerator(["ABCDEFGHIJKL", "CODE", "ODE"], grid_size=8, seed=1,
+                                       stats=stats).generate_crossword()
+        
+        assert [wp.word for wp in crossword.word_placements] == ["CODE", "ODE"]
+        assert crossword.width == 4
+        assert stats.unplaced["ABCDEFGHIJKL"] == "too_long"
     
     def test_single_word(self):
         """Test generation with single word"""
@@ -210,4 +257,316 @@ class TestCrosswordGenerator:
         
         assert "PYTHON" in generator.words
         assert "CODE" in generator.words
-        assert "TEST" in generator.words
\ No newline at end of file
+        assert "TEST" in generator.words
+    
+    def test_letter_positions_track_placed_letters(self, generator):
+        """place_word keeps the letter index in sync with the grid"""
+        grid = generator.new_grid()
+        
+        generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
+        generator.place_word(grid, "CODE", 6, 9, Direction.VERTICAL)
+        
+        # Shared 'O' cell is only indexed once
+        assert grid.letter_positions["O"] == [(7, 9)]
+        assert grid.letter_positions["C"] == [(6, 9)]
+        assert (8, 9) in grid.letter_positions["D"]
+    
+    def test_candidate_placements_are_anchored(self, generator):
+        """Every candidate lines up a letter of the word with the same letter on the grid"""
+        grid = generator.new_grid()
+        generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
+        
+        candidates = generator.find_candidate_placements(grid, "CODE")
+        assert (6, 9, Direction.VERTICAL) in candidates
+        
+        for start_row, start_col, direction in candidates:
+            if direction == Direction.HORIZONTAL:
+                cells = [(start_row, start_col + i) for i in range(4)]
+            else:
+                cells = [(start_row + i, start_col) for i in range(4)]
+            assert any(grid.letter_at(row, col) == char for (row, col), char in zip(cells, "CODE"))
+        
+        # No shared letters means no candidates at all
+        assert generator.find_candidate_placements(grid, "GRID") == []
+    
+    def test_sampled_placements_are_anchored(self, generator):
+        """Sampling draws distinct anchored placements, at most limit of them"""
+        grid = generator.new_grid()
+        generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
+        
+        sampled = list(generator.sample_candidate_placements(grid, "CODE", 100))
+        assert len(sampled) == len(set(sampled))
+        assert set(sampled) == set(generator.find_candidate_placements(grid, "CODE"))
+        assert len(list(generator.sample_candidate_placements(grid, "CODE", 1))) <= 1
+        assert list(generator.sample_candidate_placements(grid, "GRID", 100)) == []
+    
+    def test_intersection_table_built_once(self, generator):
+        """Constructor indexes letter offsets and connectivity for every word"""
+        assert generator.letter_offsets["CROSS"]["S"] == (3, 4)
+        assert generator.letter_offsets["PYTHON"]["O"] == (4,)
+        
+        # CODE shares C, O, D and E with other words in the list
+        assert generator.connectivity["CODE"] > 0
+        # PYTHON matches through P (PLACE), T (TEST x2) and O (CODE, WORD, CROSS)
+        assert generator.connectivity["PYTHON"] == 1 + 2 + 3
+    
+    def test_find_intersections_matches_nested_scan(self, generator):
+        """Table-backed lookup returns the same pairs as a full character scan"""
+        for word1 in generator.words:
+            for word2 in generator.words + ["MAGIC"]:
+                expected = [
+                    (i, j)
+                    for i, char1 in enumerate(word1)
+                    for j, char2 in enumerate(word2)
+                    if char1 == char2
+                ]
+                assert generator.find_intersections(word1, word2) == expected
+    
+    def test_cross_check_masks_match_full_scan(self, generator):
+        """Incremental cross-check masks match rebuilt perpendicular runs"""
+        grid = generator.new_grid()
+        generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
+        generator.place_word(grid, "CODE", 6, 9, Direction.VERTICAL)
+        assert generator.place_word(grid, "TEST", 7, 7, Direction.VERTICAL)
+        
+        rows = grid.to_rows()
+        
+        def perpendicular_run(row, col, char, direction):
+            if direction == Direction.HORIZONTAL:
+                column = [rows[r][col] for r in range(15)]
+                column[row] = char
+                start, end = row, row
+                while start > 0 and column[start - 1]:
+                    start -= 1
+                while end < 14 and column[end + 1]:
+                    end += 1
+                return ''.join(column[start:end + 1])
+            line = list(rows[row])
+            line[col] = char
+            start, end = col, col
+            while start > 0 and line[start - 1]:
+                start -= 1
+            while end < 14 and line[end + 1]:
+                end += 1
+            return ''.join(line[start:end + 1])
+        
+        def merges(row, col, direction):
+            # A one-letter placement also fails the boundary check when it
+            # touches a letter along its own direction
+            if direction == Direction.HORIZONTAL:
+                neighbours = [(row, col - 1), (row, col + 1)]
+            else:
+                neighbours = [(row - 1, col), (row + 1, col)]
+            return any(0 <= r < 15 and 0 <= c < 15 and rows[r][c] for r, c in neighbours)
+        
+        for row in range(15):
+            for col in range(15):
+                if rows[row][col] is not None:
+                    continue
+                for direction in (Direction.HORIZONTAL, Direction.VERTICAL):
+                    for char in "PYTHONCDESGRIWLA":
+                        run = perpendicular_run(row, col, char, direction)
+                        expected = (len(run) == 1 or run in generator.word_set) and not merges(row, col, direction)
+                        assert generator.can_place_word(grid, char, row, col, direction) == expected
+    
+    def test_backtrack_strategy_builds_valid_layout(self, test_words):
+        """Backtracking search returns connected, consistent placements"""
+        generator = CrosswordGenerator(test_words, grid_size=11, strategy="backtrack")
+        crossword = generator.generate_crossword()
+        
+        assert len(crossword.word_placements) > 1
+        assert len({wp.word for wp in crossword.word_placements}) == len(crossword.word_placements)
+        
+        assert_valid_layout(crossword)
+    
+    def test_backtrack_respects_node_limit(self, test_words):
+        """A one-node budget returns the greedy layout the search started from"""
+        stats = GenerationStats()
+        crossword = CrosswordGenerator(test_words, strategy="backtrack", seed=1, max_nodes=1,
+                                       stats=stats).generate_crossword()
+        greedy_stats = GenerationStats()
+        greedy = CrosswordGenerator(test_words, seed=1, stats=greedy_stats).generate_crossword()
+        
+        assert stats.search_nodes == 1
+        assert crossword.word_placements == greedy.word_placements
+        assert "budget" in stats.unplaced.values()
+        # Only the greedy seed layout and the search's first word are counted,
+        # not the replay of the winning layout
+        assert stats.can_place_calls == greedy_stats.can_place_calls + 1
+    
+    def test_backtrack_never_places_fewer_than_greedy(self):
+        """Long lists keep at least the greedy layout, and a spent budget is reported"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+        from bench_generator import synthetic_words
+        
+        for words, options in ((synthetic_words(1000), {}),
+                               (synthetic_words(200), {"grid_size": 41, "max_words": None})):
+            stats = GenerationStats()
+            greedy = CrosswordGenerator(words, seed=1, **options).generate_crossword()
+            crossword = CrosswordGenerator(words, strategy="backtrack", seed=1, stats=stats,
+                                           **options).generate_crossword()
+            
+            assert len(crossword.word_placements) >= len(greedy.word_placements)
+            if "max_words" in options:
+                assert "budget" in stats.unplaced.values()
+    
+    def test_backtrack_not_pruned_by_unplaceable_words(self):
+        """Words that only fit once others are placed still count towards the bound"""
+        words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PUZZLE", "CROSS",
+                 "CLUE", "ANSWER", "LETTER", "BLACK", "SQUARE", "GAME"]
+        for seed in (0, 5):
+            crossword = CrosswordGenerator(words, grid_size=15, strategy="backtrack", seed=seed).generate_crossword()
+            assert len(crossword.word_placements) == 12
+    
+    def test_backtrack_respects_check_budget(self):
+        """Forward checking counts against max_checks, bounding work per run"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+        from bench_generator import synthetic_words
+        greedy_stats = GenerationStats()
+        CrosswordGenerator(synthetic_words(60), grid_size=25, seed=1, max_words=None,
+                           stats=greedy_stats).generate_crossword()
+        stats = GenerationStats()
+        CrosswordGenerator(synthetic_words(60), grid_size=25, strategy="backtrack", seed=1,
+                           max_words=None, max_checks=5000, stats=stats).generate_crossword()
+        
+        # The greedy seed layout costs the same checks as a greedy run; the
+        # search overshoots by at most one word's candidates past the budget
+        assert stats.can_place_calls - greedy_stats.can_place_calls < 6000
+    
+    def test_unknown_strategy_rejected(self, test_words):
+        with pytest.raises(ValueError):
+            CrosswordGenerator(test_words, strategy="random")
+    
+    def test_rollback_undoes_placement(self, generator):
+        """Undo log restores cells, letter index and cross-check masks"""
+        grid = generator.new_grid()
+        generator.place_word(grid, "PYTHON", 7, 5, Direction.HORIZONTAL)
+        
+        cells = bytes(grid.cells)
+        horizontal_checks = list(grid.horizontal_checks)
+        vertical_checks = list(grid.vertical_checks)
+        
+        mark = grid.mark()
+        assert generator.place_word(grid, "CODE", 6, 9, Direction.VERTICAL)
+        grid.rollback(mark)
+        
+        assert bytes(grid.cells) == cells
+        assert grid.horizontal_checks == horizontal_checks
+        assert grid.vertical_checks == vertical_checks
+        assert grid.letter_positions["O"] == [(7, 9)]
+        assert grid.letter_positions["C"] == []
+        
+        # The same placement is valid again after undoing it
+        assert generator.can_place_word(grid, "CODE", 6, 9, Direction.VERTICAL)
+    
+    def test_seed_reproduces_layout(self, test_words):
+        """Same words, grid size, seed and strategy give the same puzzle"""
+        for strategy in ("greedy", "backtrack"):
+            first = CrosswordGenerator(test_words, strategy=strategy, seed=1234).generate_crossword()
+            second = CrosswordGenerator(test_words, strategy=strategy, seed=1234).generate_crossword()
+            
+            assert first.seed == 1234
+            assert first.grid == second.grid
+            assert first.word_placements == second.word_placements
+    
+    def test_seed_layout_independent_of_word_order(self):
+        """Shuffled and recased input with the same seed gives the same puzzle"""
+        from llm_service import LLMService
+        words = [item["word"] for item in LLMService._get_mock_words("general")]
+        
+        for seed in range(20):
+            shuffled = list(reversed(words))
+            random.Random(seed).shuffle(shuffled)
+            expected = CrosswordGenerator(words, seed=seed).generate_crossword()
+            crossword = CrosswordGenerator([word.lower() for word in shuffled], seed=seed).generate_crossword()
+            
+            assert crossword.grid == expected.grid
+            assert crossword.word_placements == expected.word_placements
+    
+    def test_seed_drawn_when_not_given(self, test_words):
+        """Unseeded generators still report a seed that regenerates their layout"""
+        crossword = CrosswordGenerator(test_words).generate_crossword()
+        replay = CrosswordGenerator(test_words, seed=crossword.seed).generate_crossword()
+        
+        assert crossword.seed is not None
+        assert replay.grid == crossword.grid
+    
+    def test_stats_explain_layout(self, test_words):
+        """Collected stats account for every call and every word left out"""
+        stats = GenerationStats()
+        crossword = CrosswordGenerator(test_words + ["ZZZ"], seed=7, stats=stats).generate_crossword()
+        plain = CrosswordGenerator(test_words + ["ZZZ"], seed=7).generate_crossword()
+        
+        assert crossword.stats is stats
+        assert plain.stats is None
+        assert crossword.word_placements == plain.word_placements
+        
+        assert stats.can_place_calls == sum(stats.word_attempts.values())
+        assert stats.rejections["boundary"] <= stats.boundary_calls
+        placed = {wp.word for wp in crossword.word_placements}
+        assert stats.unplaced["ZZZ"] == "no_anchor"
+        assert set(stats.unplaced) == set(test_words + ["ZZZ"]) - placed
+        assert set(stats.phase_ms) == {"setup", "search", "render"}
+    
+    def test_stats_count_rejection_reasons(self, generator):
+        stats = GenerationStats()
+        generator.stats = stats
+        grid = generator.new_grid()
+        generator.place_word(grid, "PYTHON", 7, 4, Direction.HORIZONTAL)
+        
+        assert not generator.can_place_word(grid, "PYTHON", 7, 12, Direction.HORIZONTAL)
+        assert not generator.can_place_word(grid, "CODE", 7, 3, Direction.HORIZONTAL)
+        assert not generator.can_place_word(grid, "CODE", 7, 10, Direction.HORIZONTAL)
+        # C above P would form "CP"
+        assert not generator.can_place_word(grid, "CODE", 6, 4, Direction.HORIZONTAL)
+        
+        assert stats.rejections == {"bounds": 1, "conflict": 1, "perpendicular": 1, "boundary": 1}
+        # place_word validates through can_place_word too
+        assert stats.word_attempts == {"PYTHON": 2, "CODE": 3}
+    
+    @pytest.mark.parametrize("strategy", ["greedy", "backtrack"])
+    def test_stats_count_perpendicular_checks(self, test_words, strategy):
+        """Every new letter tested against its cross-check mask is counted"""
+        stats = GenerationStats()
+        CrosswordGenerator(test_words, strategy=strategy, seed=2, stats=stats).generate_crossword()
+        
+        assert stats.perpendicular_calls > 0
+        assert stats.perpendicular_calls >= stats.rejections["perpendicular"]
+    
+    @pytest.mark.parametrize("strategy", ["greedy", "backtrack"])
+    def test_deadline_returns_best_so_far(self, test_words, strategy):
+        """A search cut off by its deadline still returns a valid layout"""
+        clock = itertools.count(step=1.0)
+        stats = GenerationStats()
+        generator = CrosswordGenerator(test_words, strategy=strategy, seed=3, deadline_ms=1500, stats=stats)
+        
+        with patch('crossword_generator.time.perf_counter', side_effect=lambda: next(clock)):
+            crossword = generator.generate_crossword()
+        
+        assert not crossword.completed
+        assert 1 <= len(crossword.word_placements) < len(test_words)
+        assert_valid_layout(crossword)
+        if strategy == "greedy":
+            assert "deadline" in stats.unplaced.values()
+    
+    def test_word_target(self):
+        """max_words caps the layout; None lifts the cap"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+        from bench_generator import synthetic_words
+        words = synthetic_words(200)
+        
+        assert len(CrosswordGenerator(words, grid_size=41, seed=1).generate_crossword().word_placements) == 12
+        assert len(CrosswordGenerator(words, grid_size=41, seed=1, max_words=5).generate_crossword().word_placements) == 5
+        
+        stats = GenerationStats()
+        crossword = CrosswordGenerator(words, grid_size=41, seed=1, max_words=None, stats=stats).generate_crossword()
+        assert len(crossword.word_placements) >= 100
+        assert "word_limit" not in stats.unplaced.values()
+        assert_valid_layout(crossword)
+    
+    def test_deadline_not_reached(self, test_words):
+        crossword = CrosswordGenerator(test_words, seed=3, deadline_ms=60000).generate_crossword()
+        unlimited = CrosswordGenerator(test_words, seed=3).generate_crossword()
+        
+        assert crossword.completed
+        assert crossword.word_placements == unlimited.word_placements
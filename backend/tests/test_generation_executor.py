@@ -0,0 +1,103 @@
+import pytest
+import asyncio
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from generation_executor import GenerationExecutor, ExecutorSaturated, build_crossword
+from models import WordListRequest
+from multi_start import shutdown_process_pool
+
+class TestGenerationExecutor:
+    @pytest.fixture
+    def request_model(self):
+        return WordListRequest(words=["PYTHON", "CODE", "TEST", "GRID"], seed=3)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    async def test_runs_generation_off_loop(self, kind, request_model):
+        """Both pool kinds return the same seeded crossword"""
+        executor = GenerationExecutor(kind=kind, max_workers=1)
+        try:
+            crossword = await executor.run(build_crossword, request_model)
+        finally:
+            executor.shutdown()
+        
+        assert crossword.grid == build_crossword(request_model).grid
+        assert executor.in_flight == 0
+    
+    @pytest.mark.asyncio
+    async def test_queue_limit(self, request_model):
+        """Jobs beyond max_queue are refused while others are in flight"""
+        executor = GenerationExecutor(kind="thread", max_workers=1, max_queue=1)
+        try:
+            first = asyncio.ensure_future(executor.run(build_crossword, request_model))
+            await asyncio.sleep(0)
+            
+            with pytest.raises(ExecutorSaturated):
+                await executor.run(build_crossword, request_model)
+            
+            await first
+            assert executor.in_flight == 0
+        finally:
+            executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_process_workers_run_starts_in_process(self):
+        """Multi-start inside a process worker needs no nested pool"""
+        request = WordListRequest(words=["PYTHON", "CODE", "TEST", "GRID"], seed=3, starts=3)
+        executor = GenerationExecutor(kind="process", max_workers=1)
+        try:
+            crossword = await executor.run(build_crossword, request)
+        finally:
+            executor.shutdown()
+        
+        try:
+            assert crossword.grid == build_crossword(request).grid
+        finally:
+            shutdown_process_pool()
+    
+    def test_unknown_kind_rejected(self):
+        with pytest.raises(ValueError):
+            GenerationExecutor(kind="fiber")
+    
+    @pytest.mark.asyncio
+    async def test_map_unordered_yields_every_item(self):
+        """Each item is yielded once with its key, errors included, and the window stays bounded"""
+        executor = GenerationExecutor(kind="thread", max_workers=2)
+        peak = 0
+        
+        def check(value):
+            if value == 3:
+                raise ValueError("bad item")
+            return value * 10
+        
+        try:
+            results = {}
+            async for key, result, error in executor.map_unordered(check, [(i, i) for i in range(6)]):
+                peak = max(peak, executor.in_flight + 1)
+                results[key] = error if error is not None else result
+        finally:
+            executor.shutdown()
+        
+        assert peak <= 2
+        assert executor.in_flight == 0
+        assert isinstance(results.pop(3), ValueError)
+        assert results == {0: 0, 1: 10, 2: 20, 4: 40, 5: 50}
+    
+    @pytest.mark.asyncio
+    async def test_map_unordered_releases_jobs_when_closed_early(self):
+        """Jobs finished but not yet yielded still leave in_flight when the caller stops"""
+        executor = GenerationExecutor(kind="thread", max_workers=4)
+        try:
+            results = executor.map_unordered(lambda value: value, [(i, i) for i in range(8)])
+            async for _ in results:
+                break
+            await results.aclose()
+            await asyncio.sleep(0)
+        finally:
+            executor.shutdown()
+        
+        assert executor.in_flight == 0
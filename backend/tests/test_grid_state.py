@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from grid_state import Alphabet, GridState, EMPTY
+
+class TestGridState:
+    @pytest.fixture
+    def grid(self):
+        return GridState(5, Alphabet("ABC"))
+    
+    def test_alphabet_round_trip(self):
+        """Letters map to stable 1-based codes and back"""
+        alphabet = Alphabet("CAB")
+        assert alphabet.code("C") == 1
+        assert alphabet.encode("ABC") == bytes([2, 3, 1])
+        assert alphabet.decode(alphabet.encode("CAB")) == "CAB"
+        
+        # Unknown letters get the next free code
+        assert alphabet.code("Z") == 4
+    
+    def test_empty_grid(self, grid):
+        """New grids are all zero bytes"""
+        assert len(grid.cells) == 25
+        assert grid.get(2, 3) == EMPTY
+        assert grid.letter_at(2, 3) is None
+    
+    def test_set_indexes_letter(self, grid):
+        """Writing a cell stores its code and records its position"""
+        grid.set(1, 2, "B")
+        grid.set(3, 2, "B")
+        
+        assert grid.get(1, 2) == grid.alphabet.code("B")
+        assert grid.letter_at(1, 2) == "B"
+        assert grid.letter_positions["B"] == [(1, 2), (3, 2)]
+    
+    def test_row_and_column_slices(self, grid):
+        """Slices return the codes along a row or down a column"""
+        for col, char in enumerate("ABC"):
+            grid.set(2, col + 1, char)
+        grid.set(0, 2, "C")
+        
+        assert grid.alphabet.decode(grid.row_slice(2, 1, 4)) == "ABC"
+        assert grid.col_slice(2, 0, 5) == bytes([3, EMPTY, 2, EMPTY, EMPTY])
+    
+    def test_to_rows(self, grid):
+        """Conversion produces the nested None/letter shape used by the API"""
+        grid.set(0, 0, "A")
+        grid.set(4, 4, "C")
+        
+        rows = grid.to_rows()
+        assert len(rows) == 5
+        assert all(len(row) == 5 for row in rows)
+        assert rows[0][0] == "A"
+        assert rows[4][4] == "C"
+        assert rows[2][2] is None
+    
+    def test_undo_log_only_records_under_mark(self, grid):
+        """Writes outside a mark are not logged; rollback restores the marked state"""
+        grid.set(0, 0, "A")
+        grid.set_check(grid.horizontal_checks, 1, 0)
+        assert grid.undo_log == []
+        
+        mark = grid.mark()
+        grid.set(1, 1, "B")
+        grid.set_check(grid.horizontal_checks, 2, 0)
+        assert len(grid.undo_log) == 2
+        
+        grid.rollback(mark)
+        assert grid.undo_log == []
+        assert grid.marks == []
+        assert grid.get(1, 1) == EMPTY
+        assert grid.get(0, 0) == grid.alphabet.code("A")
+        assert grid.horizontal_checks[1] == 0
+        assert grid.horizontal_checks[2] == -1
+        
+        # Once every mark is rolled back, writes stop being logged again
+        grid.set(2, 2, "C")
+        assert grid.undo_log == []
@@ -0,0 +1,118 @@
+import pytest
+import sys
+import threading
+import os
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from llm_cache import LLMResponseCache, normalize_topic
+
+class TestLLMResponseCache:
+    @pytest.fixture
+    def word_clues(self):
+        return [{"word": "HOOP", "clue": "Target for shooting"}]
+    
+    def test_normalize_topic(self):
+        assert normalize_topic("  The   Office ") == "the office"
+    
+    def test_key_includes_provider_and_prompt_version(self):
+        key = LLMResponseCache.key("Basketball", "openai", "1")
+        
+        assert key == LLMResponseCache.key(" basketball", "openai", "1")
+        assert key != LLMResponseCache.key("basketball", "anthropic", "1")
+        assert key != LLMResponseCache.key("basketball", "openai", "2")
+    
+    def test_fresh_stale_and_expired(self, word_clues):
+        cache = LLMResponseCache(ttl_seconds=10, stale_seconds=5)
+        
+        with patch("llm_cache.time.time", return_value=100.0):
+            cache.put("k", word_clues)
+        with patch("llm_cache.time.time", return_value=105.0):
+            assert cache.get("k") == (word_clues, False)
+        with patch("llm_cache.time.time", return_value=112.0):
+            assert cache.get("k") == (word_clues, True)
+        with patch("llm_cache.time.time", return_value=116.0):
+            assert cache.get("k") is None
+        
+        assert cache.stats() == {"entries": 0, "hits": 1, "stale_hits": 1, "misses": 1}
+    
+    def test_memory_lru_bound(self, word_clues):
+        cache = LLMResponseCache(max_entries=1)
+        cache.put("a", word_clues)
+        cache.put("b", word_clues)
+        
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+    
+    def test_disk_tier_survives_restart(self, tmp_path, word_clues):
+        """A new cache on the same file serves entries written by an earlier one"""
+        path = str(tmp_path / "llm.sqlite3")
+        LLMResponseCache(path=path).put("k", word_clues)
+        
+        restarted = LLMResponseCache(path=path)
+        assert restarted.get("k") == (word_clues, False)
+        assert restarted.stats()["entries"] == 1
+    
+    def test_disk_tier_swept(self, tmp_path, word_clues):
+        """Rows too old to serve and the oldest beyond max_disk_entries are deleted"""
+        cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"), ttl_seconds=10, stale_seconds=5,
+                                 max_disk_entries=2, sweep_interval=1000)
+        for i, stored_at in enumerate([100.0, 190.0, 191.0, 192.0]):
+            with patch("llm_cache.time.time", return_value=stored_at):
+                cache.put(f"k{i}", word_clues)
+        
+        with patch("llm_cache.time.time", return_value=200.0):
+            cache.sweep()
+        
+        keys = {row[0] for row in cache._conn.execute("SELECT cache_key FROM llm_responses")}
+        assert keys == {"k2", "k3"}
+    
+    def test_put_sweeps_periodically(self, tmp_path, word_clues):
+        cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"), max_disk_entries=1, sweep_interval=60)
+        cache.put("a", word_clues)
+        cache.put("b", word_clues)
+        assert cache._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 2
+        
+        with patch("llm_cache.time.time", return_value=cache._sweeper.next_at):
+            cache.put("c", word_clues)
+        assert cache._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 1
+
+    def test_failed_sweep_rolls_back(self, tmp_path, word_clues):
+        """A sweep that fails part-way leaves the connection usable for later writes"""
+        cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+        cache.SWEEP_OVERFLOW = "DELETE FROM missing_table"
+
+        with pytest.raises(Exception):
+            cache.sweep()
+
+        assert not cache._conn.in_transaction
+        cache.put("a", word_clues)
+        cache.clear()
+        assert cache._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_disk_access_runs_off_loop(self, tmp_path, word_clues):
+        """Disk reads and writes that may wait on another worker run on a thread; memory hits do not"""
+        path = str(tmp_path / "llm.sqlite3")
+        cache = LLMResponseCache(path=path)
+        loop_thread = threading.get_ident()
+        threads = []
+        
+        for name in ("_load", "_store"):
+            method = getattr(cache, name)
+            
+            def recording(*args, method=method):
+                threads.append(threading.get_ident())
+                return method(*args)
+            
+            setattr(cache, name, recording)
+        
+        await cache.put_async("k", word_clues)
+        assert await cache.get_async("k") == (word_clues, False)
+        assert len(threads) == 1 and threads[0] != loop_thread
+        
+        # A fresh process finds the row on disk
+        restarted = LLMResponseCache(path=path)
+        assert await restarted.get_async("k") == (word_clues, False)
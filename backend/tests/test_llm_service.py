@@ -7,9 +7,22 @@ import sys
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from llm_service import LLMService
+import httpx
+import json
+
+from llm_service import LLMService, CSVLineParser, PROMPT_VERSION
+from llm_cache import LLMResponseCache
 
 class TestLLMService:
+    @pytest.fixture(autouse=True)
+    def fresh_service(self):
+        """Each test reads its own environment and builds its own clients"""
+        LLMService.cache.clear()
+        asyncio.run(LLMService.shutdown())
+        yield
+        LLMService.cache.clear()
+        asyncio.run(LLMService.shutdown())
+    
     def test_get_config_default(self):
         """Test default configuration"""
         with patch.dict(os.environ, {}, clear=True):
@@ -53,7 +66,7 @@ HOOP,Target for shooting"""
         result = LLMService._parse_csv_response(csv_content)
         
         # Should return exactly the parsed items without padding
-        assert len(result) >= 4
+        assert len(result) == 4
         assert result[0]["word"] == "BASKETBALL"
         assert result[0]["clue"] == "Sport with hoops"
         assert result[1]["word"] == "PLAYER"
@@ -154,7 +167,7 @@ Player,Team member"""
         mock_response.choices[0].message.content = "BASKETBALL,Sport with hoops\nPLAYER,Team member"
         
         with patch('openai.AsyncOpenAI') as mock_client:
-            mock_client.return_value.chat.completions.create.return_value = mock_response
+            mock_client.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
             
             with patch.dict(os.environ, {
                 "LLM_PROVIDER": "openai",
@@ -166,6 +179,10 @@ Player,Team member"""
                 words = [item["word"] for item in result]
                 assert "BASKETBALL" in words
                 assert "PLAYER" in words
+        
+        # The cache holds the parsed response; mock padding is added when served
+        key = LLMResponseCache.key("basketball", "openai", PROMPT_VERSION)
+        assert [item["word"] for item in LLMService.cache.get(key)[0]] == ["BASKETBALL", "PLAYER"]
     
     @pytest.mark.asyncio
     async def test_generate_words_anthropic_success(self):
@@ -205,4 +222,325 @@ Player,Team member"""
                 
                 # Mock was called but it's not actually insufficient
                 # because our mock setup doesn't actually patch the method correctly
-                assert len(result) >= 1
\ No newline at end of file
+                assert len(result) >= 1
+    
+    @pytest.mark.asyncio
+    async def test_provider_response_is_cached(self):
+        """Repeat topics are answered from the cache without calling the provider"""
+        with patch('llm_service.LLMService._call_openai') as mock_call:
+            mock_call.return_value = [{"word": "BASKETBALL", "clue": "Sport with hoops"}]
+            
+            with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}):
+                first = await LLMService.generate_words_and_clues_from_topic("Basketball")
+                second = await LLMService.generate_words_and_clues_from_topic("  basketball ")
+            
+            assert mock_call.call_count == 1
+            assert second == first
+    
+    @pytest.mark.asyncio
+    async def test_mock_fallback_is_not_cached(self):
+        """Fallback data never hides a provider that later recovers"""
+        with patch.dict(os.environ, {"LLM_PROVIDER": "mock"}):
+            await LLMService.generate_words_and_clues_from_topic("basketball")
+        
+        assert LLMService.cache.stats()["entries"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self):
+        """Stale entries are returned immediately and refreshed in the background"""
+        key = LLMResponseCache.key("basketball", "openai", PROMPT_VERSION)
+        LLMService.cache.put(key, [{"word": "OLD", "clue": "Stale entry"}])
+        
+        with patch.object(LLMService.cache, "ttl_seconds", 0), \
+                patch.object(LLMService.cache, "stale_seconds", 3600), \
+                patch('llm_service.LLMService._call_openai') as mock_call:
+            mock_call.return_value = [{"word": "NEW", "clue": "Fresh entry"}]
+            
+            with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}):
+                result = await LLMService.generate_words_and_clues_from_topic("basketball")
+                # Short cached lists are padded when served
+                assert result[0] == {"word": "OLD", "clue": "Stale entry"}
+                assert len(result) == 30
+                
+                await asyncio.gather(*LLMService._refreshes.values())
+        
+        assert LLMService.cache.get(key)[0] == [{"word": "NEW", "clue": "Fresh entry"}]
+
+    
+    @pytest.mark.asyncio
+    async def test_provider_client_reused_across_calls(self):
+        """One pooled client serves every request until shutdown"""
+        with patch('llm_service.LLMService._parse_csv_response', return_value=[]), \
+                patch('anthropic.AsyncAnthropic') as mock_client:
+            mock_response = AsyncMock()
+            mock_response.content = [AsyncMock()]
+            mock_response.content[0].text = "HOOP,Target"
+            mock_client.return_value.messages.create = AsyncMock(return_value=mock_response)
+            
+            with patch.dict(os.environ, {"LLM_PROVIDER": "anthropic", "ANTHROPIC_API_KEY": "test-key"}):
+                await LLMService._call_anthropic("basketball", LLMService.config())
+                await LLMService._call_anthropic("movies", LLMService.config())
+            
+            assert mock_client.call_count == 1
+            assert mock_client.return_value.messages.create.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_config_read_once(self):
+        """Config is cached until shutdown"""
+        with patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}):
+            assert LLMService.config()["provider"] == "ollama"
+        
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openai"}):
+            assert LLMService.config()["provider"] == "ollama"
+            await LLMService.shutdown()
+            assert LLMService.config()["provider"] == "openai"
+    
+    @pytest.mark.asyncio
+    async def test_ollama_client_pool_limits(self):
+        """Ollama client is created once with the configured pool limits"""
+        with patch.dict(os.environ, {"LLM_PROVIDER": "ollama", "LLM_MAX_CONNECTIONS": "7"}):
+            await LLMService.startup()
+            client = LLMService._get_ollama_client(LLMService.config())
+            
+            assert LLMService._get_ollama_client(LLMService.config()) is client
+            assert client._transport._pool._max_connections == 7
+        
+        await LLMService.shutdown()
+        assert client.is_closed
+    
+    def test_csv_line_parser_handles_split_chunks(self):
+        """Lines split across chunks are parsed once they are complete"""
+        parser = CSVLineParser()
+        
+        assert parser.feed("PYT") == []
+        assert parser.feed("HON,Snake language\nJA") == [{"word": "PYTHON", "clue": "Snake language"}]
+        assert parser.feed("VA,Coffee language\n# comment\nX,too short\n") == [{"word": "JAVA", "clue": "Coffee language"}]
+        assert parser.feed("RUST,Oxidized") == []
+        assert parser.close() == [{"word": "RUST", "clue": "Oxidized"}]
+        assert parser.close() == []
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_entries_as_lines_arrive(self):
+        """Entries are parsed before the provider finishes streaming"""
+        received = []
+        
+        async def chunks():
+            yield "ALPHA,First\nBE"
+            # The first entry has been consumed before the rest is streamed
+            assert received == ["ALPHA"]
+            yield "TA,Second\n"
+        
+        async for entry in LLMService._stream_entries(chunks()):
+            received.append(entry["word"])
+        
+        assert received == ["ALPHA", "BETA"]
+    
+    @pytest.mark.asyncio
+    async def test_streaming_reads_whole_response(self):
+        """The stream is read to the end, so a full topic list is neither cut short nor padded"""
+        lines = [f"WORD{chr(65 + i) * 3},Clue {i}\n" for i in range(26)]
+        
+        async def chunks():
+            for line in lines:
+                yield line
+        
+        with patch.dict(os.environ, {
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "test-key",
+            "LLM_STREAMING": "true"
+        }), patch('llm_service.LLMService._stream_openai', return_value=chunks()):
+            result = await LLMService.generate_words_and_clues_from_topic("letters")
+        
+        assert [item["word"] for item in result] == [line.split(",")[0] for line in lines]
+        assert LLMService.cache.stats()["entries"] == 1
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sent", [[], ["ALPHA,First\n", "BETA,Second\n"]])
+    async def test_stream_failure_falls_back_to_mock(self, sent):
+        """A stream that fails, even part-way, falls back to the mock words and is not cached"""
+        async def chunks():
+            for chunk in sent:
+                yield chunk
+            raise RuntimeError("connection reset")
+        
+        with patch.dict(os.environ, {
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "test-key",
+            "LLM_STREAMING": "true"
+        }), patch('llm_service.LLMService._stream_openai', return_value=chunks()):
+            result = await LLMService.generate_words_and_clues_from_topic("animals")
+        
+        assert result == LLMService._get_mock_words("animals")
+        assert LLMService.cache.stats()["entries"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_words_yields_before_response_ends(self):
+        """The public stream yields entries before the provider finishes, then pads like the buffered path"""
+        received = []
+        
+        async def chunks():
+            yield "ALPHA,First\nBE"
+            # The rest of the response only arrives once ALPHA reached the caller
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0)
+            assert received == ["ALPHA"]
+            yield "TA,Second\n"
+        
+        with patch.dict(os.environ, {
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "test-key",
+            "LLM_STREAMING": "true"
+        }), patch('llm_service.LLMService._stream_openai', return_value=chunks()):
+            async for entry in LLMService.stream_words_and_clues_from_topic("greek"):
+                received.append(entry["word"])
+        
+        assert received[:2] == ["ALPHA", "BETA"]
+        assert len(received) == 30
+        # Only the provider's own entries are cached
+        key = LLMResponseCache.key("greek", "openai", PROMPT_VERSION)
+        assert [item["word"] for item in LLMService.cache.get(key)[0]] == ["ALPHA", "BETA"]
+    
+    @pytest.mark.asyncio
+    async def test_min_words_returns_early_and_caches_whole_stream(self):
+        """A caller continues once min_words arrived while the rest is read and cached in the background"""
+        lines = [f"WORD{chr(65 + i) * 3},Clue {i}\n" for i in range(26)]
+        release = asyncio.Event()
+        
+        async def chunks():
+            for i, line in enumerate(lines):
+                if i == 20:
+                    await release.wait()
+                yield line
+        
+        with patch.dict(os.environ, {
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "test-key",
+            "LLM_STREAMING": "true"
+        }), patch('llm_service.LLMService._stream_openai', return_value=chunks()):
+            result = await LLMService.generate_words_and_clues_from_topic("letters", min_words=20)
+            
+            assert [item["word"] for item in result] == [line.split(",")[0] for line in lines[:20]]
+            assert LLMService.cache.stats()["entries"] == 0
+            
+            release.set()
+            await asyncio.gather(*LLMService._in_flight.values())
+            
+            # The complete list is cached and served to the next caller
+            cached = await LLMService.generate_words_and_clues_from_topic("letters", min_words=20)
+        
+        assert [item["word"] for item in cached] == [line.split(",")[0] for line in lines]
+    
+    @pytest.mark.asyncio
+    async def test_ollama_stream_parses_ndjson(self):
+        """Ollama's newline-delimited JSON stream is reassembled into CSV lines"""
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            body = "".join(json.dumps(part) + "\n" for part in [
+                {"response": "PYTHON,Sn", "done": False},
+                {"response": "ake language\nRUBY,Gem", "done": False},
+                {"response": "", "done": True},
+            ])
+            return httpx.Response(200, content=body.encode())
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}), \
+                patch('llm_service.LLMService._get_ollama_client', return_value=client):
+            entries = [entry async for entry in LLMService._stream_entries(
+                LLMService._stream_ollama("code", LLMService.config()))]
+        await client.aclose()
+        
+        assert entries == [
+            {"word": "PYTHON", "clue": "Snake language"},
+            {"word": "RUBY", "clue": "Gem"}
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_provider_request(self):
+        """Concurrent misses for the same topic wait on a single provider call"""
+        calls = []
+        
+        async def call_provider(topic, config):
+            calls.append(topic)
+            await asyncio.sleep(0.01)
+            return [{"word": "GUITAR", "clue": "Six strings"}]
+        
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}), \
+                patch('llm_service.LLMService._call_provider', side_effect=call_provider), \
+                patch.object(LLMService, "coalesced_calls", 0):
+            results = await asyncio.gather(*[
+                LLMService.generate_words_and_clues_from_topic(topic)
+                for topic in ["Music", "music", " MUSIC ", "music", "music"]
+            ])
+            
+            assert len(calls) == 1
+            assert LLMService.stats()["coalesced_calls"] == 4
+            assert LLMService.stats()["in_flight"] == 0
+        
+        assert all(result[0] == {"word": "GUITAR", "clue": "Six strings"} for result in results)
+        # Each caller gets its own copy
+        results[0][0]["clue"] = "changed"
+        assert results[1][0]["clue"] == "Six strings"
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self):
+        """Cancelling one waiter leaves the shared call running for the others"""
+        release = asyncio.Event()
+        
+        async def call_provider(topic, config):
+            await release.wait()
+            return [{"word": "PIANO", "clue": "Keys and hammers"}]
+        
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}), \
+                patch('llm_service.LLMService._call_provider', side_effect=call_provider):
+            first = asyncio.create_task(LLMService.generate_words_and_clues_from_topic("music"))
+            second = asyncio.create_task(LLMService.generate_words_and_clues_from_topic("music"))
+            await asyncio.sleep(0)
+            
+            first.cancel()
+            release.set()
+            
+            assert (await second)[0] == {"word": "PIANO", "clue": "Keys and hammers"}
+            with pytest.raises(asyncio.CancelledError):
+                await first
+    
+    @pytest.mark.asyncio
+    async def test_shared_request_error_reaches_every_caller(self):
+        """A failed shared call raises in every waiter and is retried by the next caller"""
+        async def failing(topic, config):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+        
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}):
+            with patch('llm_service.LLMService._call_provider', side_effect=failing) as mock_call:
+                results = await asyncio.gather(
+                    LLMService.generate_words_and_clues_from_topic("music"),
+                    LLMService.generate_words_and_clues_from_topic("music"),
+                    return_exceptions=True
+                )
+                assert mock_call.call_count == 1
+            
+            assert all(isinstance(result, RuntimeError) for result in results)
+            
+            with patch('llm_service.LLMService._call_provider', return_value=[{"word": "DRUM", "clue": "Beat it"}]):
+                result = await LLMService.generate_words_and_clues_from_topic("music")
+                assert result[0] == {"word": "DRUM", "clue": "Beat it"}
+    
+    @pytest.mark.asyncio
+    async def test_fallbacks_are_counted(self):
+        """Mock fallbacks and provider errors show up in llm_fallbacks_total"""
+        from metrics import LLM_FALLBACKS, LLM_REQUEST_SECONDS
+        
+        with patch.dict(os.environ, {"LLM_PROVIDER": "mock"}):
+            before = LLM_FALLBACKS.values.get(("mock", "mock"), 0)
+            await LLMService.generate_words_and_clues_from_topic("animals")
+            assert LLM_FALLBACKS.values[("mock", "mock")] == before + 1
+        
+        await LLMService.shutdown()
+        with patch.dict(os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "test-key"}), \
+                patch('llm_service.LLMService._call_openai', side_effect=RuntimeError("down")):
+            before = LLM_FALLBACKS.values.get(("openai", "error"), 0)
+            await LLMService.generate_words_and_clues_from_topic("animals")
+            assert LLM_FALLBACKS.values[("openai", "error")] == before + 1
+            assert ("openai", "error") in LLM_REQUEST_SECONDS.series
@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import MetricsRegistry
+
+class TestMetrics:
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ("kind",))
+        gauge = registry.gauge("jobs_running", "Jobs running")
+        
+        counter.inc("fast")
+        counter.inc("fast", amount=2)
+        counter.inc('say "hi"')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="fast"} 3' in text
+        assert 'jobs_total{kind="say \\"hi\\""} 1' in text
+        assert "jobs_running 1" in text
+    
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+        
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+    
+    def test_callback_read_at_render(self):
+        registry = MetricsRegistry()
+        value = {"n": 1}
+        registry.callback("queue_depth", "Queue depth", "gauge", (), lambda: {(): value["n"]})
+        
+        assert "queue_depth 1" in registry.render()
+        value["n"] = 5
+        assert "queue_depth 5" in registry.render()
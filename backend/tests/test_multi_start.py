@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from multi_start import generate_best_crossword, get_process_pool, score_layout, shutdown_process_pool
+from models import CrosswordGrid, WordPlacement, Direction
+from conftest import assert_valid_layout
+
+class TestMultiStart:
+    @pytest.fixture
+    def test_words(self):
+        return ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+    
+    @pytest.fixture(autouse=True)
+    def pool(self):
+        yield
+        shutdown_process_pool()
+    
+    def test_score_layout(self):
+        """Score counts words, shared cells and bounding-box density"""
+        grid = [[None for _ in range(5)] for _ in range(5)]
+        for i, letter in enumerate("CAT"):
+            grid[1][1 + i] = letter
+        for i, letter in enumerate("ART"):
+            grid[1 + i][2] = letter
+        
+        crossword = CrosswordGrid(
+            grid=grid,
+            width=5,
+            height=5,
+            word_placements=[
+                WordPlacement(word="CAT", start_row=1, start_col=1, direction=Direction.HORIZONTAL, number=1),
+                WordPlacement(word="ART", start_row=1, start_col=2, direction=Direction.VERTICAL, number=2),
+            ]
+        )
+        
+        words, intersections, density = score_layout(crossword)
+        assert words == 2
+        assert intersections == 1
+        assert density == pytest.approx(5 / 9)
+    
+    def test_sequential_starts_match_pool(self, test_words, monkeypatch):
+        """Process workers pick the same seeded layout"""
+        import multi_start
+        pooled = generate_best_crossword(test_words, starts=3, seed=42)
+        shutdown_process_pool()
+        
+        monkeypatch.setattr(multi_start, "_sequential_starts", True)
+        sequential = generate_best_crossword(test_words, starts=3, seed=42)
+        
+        assert sequential.grid == pooled.grid
+        assert sequential.seed == pooled.seed
+        assert multi_start._process_pool is None
+    
+    def test_process_pool_created_once(self):
+        """Threads racing for the shared pool all get the same one"""
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            pools = list(threads.map(lambda _: get_process_pool(), range(32)))
+        
+        assert all(pool is pools[0] for pool in pools)
+    
+    def test_generate_best_crossword(self, test_words):
+        """Best of several runs is a complete, consistent layout"""
+        crossword = generate_best_crossword(test_words, starts=3)
+        
+        assert len(crossword.word_placements) > 1
+        assert_valid_layout(crossword)
+    
+    def test_deadline_still_returns_a_layout(self, test_words):
+        """An already-expired deadline returns the first finished layout"""
+        crossword = generate_best_crossword(test_words, starts=4, deadline_ms=1)
+        assert len(crossword.word_placements) > 0
+    
+    def test_winning_seed_regenerates_layout(self, test_words):
+        """The returned seed reproduces the best layout in a single run"""
+        from crossword_generator import CrosswordGenerator
+        
+        best = generate_best_crossword(test_words, starts=3, seed=42)
+        again = generate_best_crossword(test_words, starts=3, seed=42)
+        replay = CrosswordGenerator(test_words, seed=best.seed).generate_crossword()
+        
+        assert again.grid == best.grid
+        assert replay.grid == best.grid
@@ -0,0 +1,67 @@
+import sys
+import os
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from result_cache import ResultCache, crossword_cache_key
+
+class TestResultCache:
+    def test_key_uses_normalized_sorted_words(self):
+        """Order, case, whitespace and filtered words do not change the key"""
+        key = crossword_cache_key(["python", " Code", "TEST"], 15, 7, "greedy")
+        
+        assert key == crossword_cache_key(["TEST", "PYTHON", "CODE", "A", "123"], 15, 7, "greedy")
+        assert key != crossword_cache_key(["TEST", "PYTHON", "CODE"], 15, 8, "greedy")
+        assert key != crossword_cache_key(["TEST", "PYTHON", "CODE"], 21, 7, "greedy")
+        assert key != crossword_cache_key(["TEST", "PYTHON", "CODE"], 15, 7, "backtrack")
+    
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache()
+        
+        assert cache.get("a") is None
+        cache.put("a", b"body")
+        assert cache.get("a") == b"body"
+        
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_lru_eviction_by_entries(self):
+        """Least recently used entry goes first"""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.evictions == 1
+    
+    def test_byte_budget(self):
+        """Entries are evicted to stay within the byte budget"""
+        cache = ResultCache(max_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"123456")
+        
+        assert cache.get("a") is None
+        assert cache.size_bytes == 6
+        
+        # Oversized bodies are never cached
+        cache.put("c", b"x" * 11)
+        assert cache.get("c") is None
+        assert cache.get("b") == b"123456"
+    
+    def test_ttl_expiry(self):
+        cache = ResultCache(ttl_seconds=10)
+        
+        with patch("result_cache.time.monotonic", return_value=100.0):
+            cache.put("a", b"body")
+        with patch("result_cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == b"body"
+        with patch("result_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        
+        assert cache.size_bytes == 0
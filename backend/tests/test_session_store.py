@@ -0,0 +1,192 @@
+import pytest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_store import InMemorySessionStore, SQLiteSessionStore, create_session_store
+
+class TestInMemorySessionStore:
+    @pytest.fixture
+    def word_clues(self):
+        return [
+            {"word": "PYTHON", "clue": "Programming language"},
+            {"word": "CODE", "clue": "Programming instructions"}
+        ]
+    
+    def test_put_and_get(self, word_clues):
+        store = InMemorySessionStore()
+        store.put("abc", word_clues)
+        
+        assert store.get("abc") == {"PYTHON": "Programming language", "CODE": "Programming instructions"}
+        assert store.get("missing") is None
+    
+    def test_words_are_interned(self, word_clues):
+        """The same word in different sessions shares one string object"""
+        store = InMemorySessionStore()
+        store.put("a", word_clues)
+        store.put("b", [{"word": "".join(["PY", "THON"]), "clue": "Snake"}])
+        
+        first = next(word for word in store.get("a") if word == "PYTHON")
+        second = next(iter(store.get("b")))
+        assert first is second
+    
+    def test_lru_eviction(self, word_clues):
+        store = InMemorySessionStore(max_entries=2)
+        store.put("a", word_clues)
+        store.put("b", word_clues)
+        store.get("a")
+        store.put("c", word_clues)
+        
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self, word_clues):
+        store = InMemorySessionStore(ttl_seconds=60)
+        
+        with patch("session_store.time.monotonic", return_value=0.0):
+            store.put("a", word_clues)
+        with patch("session_store.time.monotonic", return_value=61.0):
+            assert store.get("a") is None
+        
+        assert store.stats()["entries"] == 0
+    
+    def test_byte_gauge_tracks_entries(self, word_clues):
+        """Approximate size grows with entries and returns to zero when they leave"""
+        store = InMemorySessionStore(max_entries=1)
+        store.put("a", word_clues)
+        size = store.size_bytes
+        
+        assert size > 0
+        store.put("b", word_clues)
+        assert store.size_bytes == size
+        
+        store.put("b", word_clues[:1])
+        assert 0 < store.size_bytes < size
+
+class TestSQLiteSessionStore:
+    @pytest.fixture
+    def word_clues(self):
+        return [
+            {"word": "PYTHON", "clue": "Programming language"},
+            {"word": "CODE", "clue": "Programming instructions"}
+        ]
+    
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "sessions.sqlite3")
+    
+    def test_put_and_get(self, db_path, word_clues):
+        store = SQLiteSessionStore(db_path)
+        store.put("abc", word_clues)
+        
+        assert store.get("abc") == {"PYTHON": "Programming language", "CODE": "Programming instructions"}
+        assert store.get("missing") is None
+        store.close()
+    
+    def test_shared_between_connections(self, db_path, word_clues):
+        """A session written by one worker is visible to another"""
+        writer = SQLiteSessionStore(db_path)
+        reader = SQLiteSessionStore(db_path)
+        
+        writer.put("abc", word_clues)
+        assert reader.get("abc")["CODE"] == "Programming instructions"
+        
+        writer.close()
+        reader.close()
+    
+    def test_wal_mode(self, db_path):
+        store = SQLiteSessionStore(db_path)
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.close()
+    
+    def test_replacing_a_session(self, db_path, word_clues):
+        store = SQLiteSessionStore(db_path)
+        store.put("abc", word_clues)
+        store.put("abc", word_clues[:1])
+        
+        assert store.get("abc") == {"PYTHON": "Programming language"}
+        store.close()
+    
+    def test_expiry_and_sweep(self, db_path, word_clues):
+        store = SQLiteSessionStore(db_path, ttl_seconds=60)
+        
+        with patch("session_store.time.time", return_value=1000.0):
+            store.put("old", word_clues)
+        with patch("session_store.time.time", return_value=1030.0):
+            store.put("new", word_clues)
+        
+        with patch("session_store.time.time", return_value=1070.0):
+            assert store.get("old") is None
+            assert store.get("new") is not None
+            store.sweep()
+        
+        assert store.stats()["entries"] == 1
+        assert store._conn.execute("SELECT COUNT(*) FROM clues").fetchone()[0] == len(word_clues)
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_async_access_runs_off_loop(self, db_path, word_clues):
+        """Writes that may wait on another worker's lock never run on the event loop thread"""
+        store = SQLiteSessionStore(db_path)
+        loop_thread = threading.get_ident()
+        threads = []
+        put = store.put
+        
+        def recording_put(*args):
+            threads.append(threading.get_ident())
+            put(*args)
+        
+        store.put = recording_put
+        await store.put_async("abc", word_clues)
+        
+        assert threads and threads[0] != loop_thread
+        assert (await store.get_async("abc"))["CODE"] == "Programming instructions"
+        store.close()
+    
+    def test_failed_sweep_rolls_back(self, db_path, word_clues):
+        """A sweep that fails part-way leaves the connection usable for later writes"""
+        store = SQLiteSessionStore(db_path)
+        store.SWEEP_SESSIONS = "DELETE FROM missing_table"
+        
+        with pytest.raises(Exception):
+            store.sweep()
+        
+        assert not store._conn.in_transaction
+        store.put("abc", word_clues)
+        assert store.get("abc")["CODE"] == "Programming instructions"
+        store.close()
+    
+    def test_stats_use_counted_entries(self, db_path, word_clues):
+        """stats() reports the count from the last sweep without querying"""
+        store = SQLiteSessionStore(db_path)
+        store.put("abc", word_clues)
+        assert store.stats()["entries"] == 0
+        
+        store.sweep()
+        assert store.stats()["entries"] == 1
+        # A new connection counts the sessions already on disk
+        other = SQLiteSessionStore(db_path)
+        assert other.stats()["entries"] == 1
+        other.close()
+        store.close()
+
+class TestCreateSessionStore:
+    def test_default_is_memory(self):
+        with patch.dict(os.environ, {}, clear=True):
+            assert isinstance(create_session_store(), InMemorySessionStore)
+    
+    def test_sqlite_backend(self, tmp_path):
+        with patch.dict(os.environ, {"SESSION_STORE": "sqlite", "SESSION_DB_PATH": str(tmp_path / "s.db")}):
+            store = create_session_store()
+            assert isinstance(store, SQLiteSessionStore)
+            store.close()
+    
+    def test_unknown_backend(self):
+        with patch.dict(os.environ, {"SESSION_STORE": "redis"}):
+            with pytest.raises(ValueError):
+                create_session_store()
@@ -0,0 +1,64 @@
+import pytest
+import asyncio
+import json
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from timing import RequestTimings, ServerTimingMiddleware, current_timings, span
+
+async def endpoint(scope, receive, send):
+    with span("work"):
+        await asyncio.sleep(0)
+    with span("work"):
+        pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+async def call(app):
+    messages = []
+    
+    async def send(message):
+        messages.append(message)
+    
+    scope = {"type": "http", "method": "GET", "path": "/thing"}
+    await app(scope, None, send)
+    return messages
+
+class TestTiming:
+    def test_span_without_request_is_noop(self):
+        with span("work"):
+            pass
+        assert current_timings() is None
+    
+    def test_header_format(self):
+        timings = RequestTimings()
+        timings.add("llm", 12.34)
+        timings.add("generate", 1.0)
+        timings.add("generate", 2.0)
+        
+        assert timings.header() == "llm;dur=12.3, generate;dur=3.0"
+    
+    @pytest.mark.asyncio
+    async def test_middleware_adds_server_timing(self):
+        messages = await call(ServerTimingMiddleware(endpoint))
+        
+        headers = dict(messages[0]["headers"])
+        value = headers[b"server-timing"].decode()
+        assert value.startswith("work;dur=")
+        assert "total;dur=" in value
+        # Repeated spans are merged into one entry
+        assert value.count("work;") == 1
+        assert current_timings() is None
+    
+    @pytest.mark.asyncio
+    async def test_middleware_logs_json_line(self, capsys):
+        await call(ServerTimingMiddleware(endpoint, log=True))
+        
+        line = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert line["event"] == "request_timing"
+        assert line["path"] == "/thing"
+        assert line["status"] == 200
+        assert set(line["spans_ms"]) == {"work", "total"}
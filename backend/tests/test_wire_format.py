@@ -0,0 +1,64 @@
+import pytest
+import json
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import wire_format
+from crossword_generator import CrosswordGenerator
+from models import Direction
+from wire_format import BLOCK, encode_crossword, negotiate_format
+
+class TestWireFormat:
+    @pytest.fixture
+    def crossword(self):
+        return CrosswordGenerator(["PYTHON", "CODE", "TEST", "GRID", "WORD"], seed=5).generate_crossword()
+    
+    def test_negotiate_format(self):
+        """The query parameter wins, then the first compact media type in Accept"""
+        assert negotiate_format(None, None) == "json"
+        assert negotiate_format(None, "application/json, */*") == "json"
+        assert negotiate_format(None, "application/vnd.crossword.rows+json") == "rows"
+        assert negotiate_format(None, "text/html, application/vnd.crossword.placements+json;q=0.9") == "placements"
+        assert negotiate_format("json", "application/vnd.crossword.rows+json") == "json"
+    
+    def test_json_matches_crossword(self, crossword):
+        data = json.loads(encode_crossword(crossword, "greedy"))
+        
+        assert data["grid"] == crossword.grid
+        assert data["width"] == crossword.width
+        assert data["strategy"] == "greedy"
+        assert data["word_placements"][0]["direction"] in ("horizontal", "vertical")
+    
+    def test_rows_rebuild_grid(self, crossword):
+        """Fixed-width rows carry the same cells as the full grid"""
+        data = json.loads(encode_crossword(crossword, "greedy", "rows"))
+        
+        assert data["format"] == "rows"
+        assert len(data["rows"]) == crossword.height
+        grid = [[None if cell == BLOCK else cell for cell in row] for row in data["rows"]]
+        assert grid == crossword.grid
+    
+    def test_placements_derive_grid(self, crossword):
+        """A client can rebuild the grid from the compact placements alone"""
+        data = json.loads(encode_crossword(crossword, "greedy", "placements"))
+        assert "rows" not in data and "grid" not in data
+        
+        grid = [[None] * data["width"] for _ in range(data["height"])]
+        for word, row, col, direction, number, clue in data["placements"]:
+            for i, letter in enumerate(word):
+                if direction == Direction.HORIZONTAL.value[0]:
+                    grid[row][col + i] = letter
+                else:
+                    grid[row + i][col] = letter
+        assert grid == crossword.grid
+        assert [p[4] for p in data["placements"]] == [wp.number for wp in crossword.word_placements]
+    
+    @pytest.mark.parametrize("fmt", ["json", "rows", "placements"])
+    def test_stdlib_fallback_matches(self, crossword, fmt, monkeypatch):
+        """Without orjson the same payload is produced with the json module"""
+        expected = json.loads(encode_crossword(crossword, "greedy", fmt))
+        monkeypatch.setattr(wire_format, "orjson", None)
+        assert json.loads(encode_crossword(crossword, "greedy", fmt)) == expected
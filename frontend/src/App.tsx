@@ -13,7 +13,6 @@ function App() {
   const [crossword, setCrossword] = useState<CrosswordGridType | null>(null);
   const [clues, setClues] = useState<CluesData>({});
   const [userGrid, setUserGrid] = useState<string[][]>([]);
-  const [currentCrosswordId, setCurrentCrosswordId] = useState<string | null>(null);
   const [selectedWord, setSelectedWord] = useState<WordPlacement | null>(null);
   const [showErrors, setShowErrors] = useState(false);
   const [showSolution, setShowSolution] = useState(false);
@@ -30,23 +29,18 @@ function App() {
     setError(null);
     
     try {
-      // Generate words from topic
-      const wordsResponse = await apiService.generateWordsFromTopic(topic);
+      // Generate words, crossword and clues in one request
+      const puzzleResponse = await apiService.generatePuzzle(topic);
       
-      // Generate crossword
-      const crosswordResponse = await apiService.generateCrossword(
-        wordsResponse.words, 
-        wordsResponse.crossword_id
-      );
-      
-      // Get clues
-      const cluesResponse = await apiService.getClues(wordsResponse.crossword_id);
+      const puzzleClues: CluesData = {};
+      puzzleResponse.word_placements.forEach(placement => {
+        puzzleClues[placement.word] = placement.clue;
+      });
       
       // Set state
-      setCrossword(crosswordResponse);
-      setClues(cluesResponse.clues);
-      setUserGrid(initializeUserGrid(crosswordResponse.grid));
-      setCurrentCrosswordId(wordsResponse.crossword_id);
+      setCrossword(puzzleResponse);
+      setClues(puzzleClues);
+      setUserGrid(initializeUserGrid(puzzleResponse.grid));
       setSelectedWord(null);
       setShowErrors(false);
       setShowSolution(false);
@@ -77,7 +71,6 @@ function App() {
       setCrossword(crosswordResponse);
       setClues(fallbackClues);
       setUserGrid(initializeUserGrid(crosswordResponse.grid));
-      setCurrentCrosswordId(null);
       setSelectedWord(null);
       setShowErrors(false);
       setShowSolution(false);
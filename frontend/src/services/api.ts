@@ -1,4 +1,4 @@
-import { GenerateWordsResponse, GenerateCrosswordResponse, CluesResponse } from '../types';
+import { GenerateCrosswordResponse, GeneratePuzzleResponse } from '../types';
 
 // API base URL - detects subpath and uses correct /api prefix
 const getApiBaseUrl = (): string => {
@@ -40,13 +40,6 @@ class ApiService {
     return response.json();
   }
 
-  async generateWordsFromTopic(topic: string): Promise<GenerateWordsResponse> {
-    return this.request<GenerateWordsResponse>('/generate-from-topic', {
-      method: 'POST',
-      body: JSON.stringify({ topic }),
-    });
-  }
-
   async generateCrossword(words: string[], crosswordId?: string): Promise<GenerateCrosswordResponse> {
     return this.request<GenerateCrosswordResponse>('/generate-crossword', {
       method: 'POST',
@@ -57,8 +50,11 @@ class ApiService {
     });
   }
 
-  async getClues(crosswordId: string): Promise<CluesResponse> {
-    return this.request<CluesResponse>(`/clues/${crosswordId}`);
+  async generatePuzzle(topic: string): Promise<GeneratePuzzleResponse> {
+    return this.request<GeneratePuzzleResponse>('/generate-puzzle', {
+      method: 'POST',
+      body: JSON.stringify({ topic }),
+    });
   }
 
   async healthCheck(): Promise<{ status: string; service: string }> {
@@ -18,11 +18,6 @@ export interface CluesData {
   [word: string]: string;
 }
 
-export interface GenerateWordsResponse {
-  words: string[];
-  crossword_id: string;
-}
-
 export interface GenerateCrosswordResponse {
   grid: (string | null)[][];
   word_placements: WordPlacement[];
@@ -30,6 +25,8 @@ export interface GenerateCrosswordResponse {
   height: number;
 }
 
-export interface CluesResponse {
-  clues: CluesData;
+// Crossword with each placement's clue filled in server-side
+export interface GeneratePuzzleResponse extends GenerateCrosswordResponse {
+  seed: number | null;
+  strategy: string;
 }
\ No newline at end of file